@@ -0,0 +1,55 @@
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from src.configs.container_config import container
+from src.repositories.user_repository import UserRepository
+from src.services.auth_service import AuthService
+from src.repositories.revoked_token_repository import RevokedTokenRepository
+from src.services.jwt_service import JwtService
+from src.services.token_revocation_service import TokenRevocationService
+from src.services.user_service import UserService
+from src.utils.validators import EmailDeliverabilityChecker
+from src.utils.write_behind import WriteBehindBuffer
+
+ITERATIONS = 100_000
+
+
+def per_request_graph() -> AuthService:
+    user_repository = UserRepository()
+    return AuthService(
+        UserService(user_repository),
+        JwtService(),
+        user_repository,
+        WriteBehindBuffer(),
+        EmailDeliverabilityChecker(),
+        TokenRevocationService(RevokedTokenRepository()),
+    )
+
+
+def container_graph() -> AuthService:
+    return container.resolve(AuthService)
+
+
+def measure(name: str, build: Callable[[], Any]) -> None:
+    build()
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        build()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    kept = [build() for _ in range(1_000)]
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, "filename")) - len(kept) * 8
+
+    print(f"{name:<20} {elapsed / ITERATIONS * 1e6:8.2f} us/request {allocated / 1_000:10.0f} bytes/request")
+
+
+if __name__ == "__main__":
+    measure("per-request graph", per_request_graph)
+    measure("container singleton", container_graph)
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+from src.configs.config import get_settings
+from src.configs.database_config import MongoDB
+from src.main import app
+
+REQUESTS = int(os.environ.get("BENCHMARK_REQUESTS", "2000"))
+CONCURRENCY = int(os.environ.get("BENCHMARK_CONCURRENCY", "50"))
+USERNAME = "driver-benchmark"
+PASSWORD = "driver-benchmark-password"
+
+results: list[str] = []
+
+
+async def authenticate(client: httpx.AsyncClient) -> dict[str, str]:
+    await client.post("/api/auth/register", json={"username": USERNAME, "password": PASSWORD})
+    await MongoDB.get_collection("users").update_one({"username": USERNAME}, {"$set": {"role": "ADMIN"}})
+    response = await client.post("/api/auth/login", json={"username": USERNAME, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict[str, str]) -> None:
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(None)
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    driver = get_settings().MONGODB_DRIVER
+    print(
+        f"{driver:<8} {path:<14} {REQUESTS / elapsed:9.0f} req/s "
+        f"p50={quantiles[49] * 1000:7.2f}ms p95={quantiles[94] * 1000:7.2f}ms p99={quantiles[98] * 1000:7.2f}ms "
+        f"errors={errors}",
+    )
+    results.append(
+        f"| {driver} | `{path}` | {REQUESTS / elapsed:.0f} | {quantiles[49] * 1000:.2f} | {quantiles[94] * 1000:.2f} | "
+        f"{quantiles[98] * 1000:.2f} | {errors} |",
+    )
+
+
+async def run(driver: str) -> None:
+    os.environ["MONGODB_DRIVER"] = driver
+    get_settings.cache_clear()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            headers = await authenticate(client)
+            for path in ("/api/auth/me", "/api/users"):
+                await client.get(path, headers=headers)
+                await measure(client, path, headers)
+
+
+if __name__ == "__main__":
+    for driver in sys.argv[1:] or ["motor", "pymongo"]:
+        asyncio.run(run(driver))
+
+    print(f"\n{REQUESTS} requests per endpoint, concurrency {CONCURRENCY}:\n")
+    print("| Driver | Endpoint | req/s | p50 ms | p95 ms | p99 ms | Errors |")
+    print("| --- | --- | ---: | ---: | ---: | ---: | ---: |")
+    print("\n".join(results))
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SIDE_EFFECT_CHECK = "from src.configs.database_config import MongoDB; print('MONGO_CONNECTED' if MongoDB._client is not None else '')"
+
+
+class ImportRecord:
+    def __init__(self, name: str, self_us: int, cumulative_us: int, depth: int) -> None:
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    records: list[ImportRecord] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        stripped = name.lstrip(" ")
+        records.append(ImportRecord(stripped, int(self_us), int(cumulative_us), (len(name) - len(stripped) - 1) // 2))
+    return records
+
+
+def profile_once(module: str) -> tuple[list[ImportRecord], bool]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}; {SIDE_EFFECT_CHECK}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return parse_importtime(result.stderr), "MONGO_CONNECTED" in result.stdout
+
+
+def summarize(runs: list[list[ImportRecord]], module: str) -> dict[str, dict[str, float]]:
+    cumulative: dict[str, list[int]] = {}
+    self_time: dict[str, list[int]] = {}
+    for records in runs:
+        for record in records:
+            cumulative.setdefault(record.name, []).append(record.cumulative_us)
+            self_time.setdefault(record.name, []).append(record.self_us)
+
+    totals = [sum(record.self_us for record in records) for records in runs]
+    return {
+        "total": {module: statistics.median(totals) / 1000},
+        "cumulative": {name: statistics.median(values) / 1000 for name, values in cumulative.items()},
+        "self": {name: statistics.median(values) / 1000 for name, values in self_time.items()},
+    }
+
+
+def top_level_packages(records: list[ImportRecord]) -> dict[str, float]:
+    packages: dict[str, float] = {}
+    for record in records:
+        package = record.name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0.0) + record.self_us / 1000
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile the import time of the application in a fresh interpreter.")
+    parser.add_argument("module", nargs="?", default="src.main")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs to take the median over")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print per table")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Exit with status 1 when the median total exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    runs: list[list[ImportRecord]] = []
+    connected = False
+    for _ in range(args.repeat):
+        records, run_connected = profile_once(args.module)
+        runs.append(records)
+        connected = connected or run_connected
+
+    summary = summarize(runs, args.module)
+    total_ms = summary["total"][args.module]
+    packages = top_level_packages(runs[-1])
+
+    if args.json:
+        print(json.dumps({**summary, "packages": packages, "mongo_connected_on_import": connected}, indent=2))
+    else:
+        print(f"{args.module}: {total_ms:.1f} ms median over {args.repeat} runs\n")
+        print(f"{'package':<40} {'self ms':>10}")
+        for name, elapsed in sorted(packages.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"{name:<40} {elapsed:10.1f}")
+        print(f"\n{'module':<60} {'cumulative ms':>14}")
+        for name, elapsed in sorted(summary["cumulative"].items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"{name:<60} {elapsed:14.1f}")
+
+    failed = False
+    if connected:
+        print(f"\nImporting {args.module} opened a MongoDB client; connect in lifespan instead.", file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nImport budget exceeded: {total_ms:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import importlib
+import json
+import pkgutil
+from typing import Any, Literal
+
+from pydantic import BaseModel
+from pymongo import MongoClient
+from pymongo.collection import Collection
+
+from src.configs.config import get_settings
+import src.entities
+from src.utils.mongo_model import MongoBaseModel
+from src.utils.mongo_setup import IndexFields, MongoSetup
+
+FindingKind = Literal["unused", "redundant", "missing", "undeclared", "not_created"]
+
+RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists", "$regex")
+CONSTRAINT_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression", "sparse")
+
+
+class IndexFinding(BaseModel):
+    namespace: str
+    kind: FindingKind
+    index_name: str
+    key: IndexFields
+    size_bytes: int
+    detail: str
+
+
+class CollectionIndexes(BaseModel):
+    namespace: str
+    document_count: int
+    declared: dict[str, IndexFields]
+    existing: dict[str, dict[str, Any]]
+    accesses: dict[str, int]
+    sizes: dict[str, int]
+
+
+def load_entity_models() -> list[type[MongoBaseModel]]:
+    for module in pkgutil.iter_modules(src.entities.__path__, f"{src.entities.__name__}."):
+        importlib.import_module(module.name)
+    return MongoSetup.entity_models()
+
+
+def read_collection_indexes(collection: Collection, declared: dict[str, IndexFields]) -> CollectionIndexes:
+    existing = {
+        name: {**info, "key": [(field, direction) for field, direction in info["key"]]} for name, info in collection.index_information().items()
+    }
+
+    accesses: dict[str, int] = {}
+    for stats in collection.aggregate([{"$indexStats": {}}]):
+        accesses[stats["name"]] = accesses.get(stats["name"], 0) + int(stats["accesses"]["ops"])
+
+    sizes: dict[str, int] = {}
+    document_count = 0
+    for stats in collection.aggregate([{"$collStats": {"storageStats": {}}}]):
+        storage: dict[str, Any] = stats.get("storageStats", {})
+        document_count += int(storage.get("count", 0))
+        for name, size in storage.get("indexSizes", {}).items():
+            sizes[name] = sizes.get(name, 0) + int(size)
+
+    return CollectionIndexes(
+        namespace=f"{collection.database.name}.{collection.name}",
+        document_count=document_count,
+        declared=declared,
+        existing=existing,
+        accesses=accesses,
+        sizes=sizes,
+    )
+
+
+def read_shape_log(path: str | None) -> list[dict[str, Any]]:
+    if not path:
+        return []
+
+    entries: dict[str, dict[str, Any]] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry: dict[str, Any] = json.loads(line)
+                    entries[f"{entry['namespace']}:{entry['operation']}:{json.dumps(entry['shape'], sort_keys=True)}"] = entry
+    except FileNotFoundError:
+        return []
+    return list(entries.values())
+
+
+def candidate_key(shape: dict[str, Any]) -> IndexFields:
+    # Equality fields first and range fields last, so the candidate follows the equality-range rule.
+    equality: list[str] = []
+    ranges: list[str] = []
+    for field, value in shape.items():
+        if field.startswith("$"):
+            continue
+        if isinstance(value, dict) and any(operator in RANGE_OPERATORS for operator in value):
+            ranges.append(field)
+        else:
+            equality.append(field)
+    return [(field, 1) for field in equality + ranges]
+
+
+def is_prefix(key: IndexFields, other: IndexFields) -> bool:
+    return len(key) <= len(other) and other[: len(key)] == key
+
+
+def estimate_size(indexes: CollectionIndexes, key: IndexFields) -> int:
+    # Rough: scale the per-document size of the _id index by the number of key fields.
+    if not indexes.document_count:
+        return 0
+    per_field = indexes.sizes.get("_id_", 0) / indexes.document_count
+    return int(per_field * len(key) * indexes.document_count)
+
+
+def analyze(indexes: CollectionIndexes, shapes: list[dict[str, Any]], min_ops: int = 0) -> list[IndexFinding]:
+    findings: list[IndexFinding] = []
+
+    def add(kind: FindingKind, name: str, key: IndexFields, detail: str, size: int | None = None) -> None:
+        findings.append(
+            IndexFinding(
+                namespace=indexes.namespace,
+                kind=kind,
+                index_name=name,
+                key=key,
+                size_bytes=indexes.sizes.get(name, 0) if size is None else size,
+                detail=detail,
+            ),
+        )
+
+    redundant: set[str] = set()
+    for name, info in indexes.existing.items():
+        if name == "_id_" or any(option in info for option in CONSTRAINT_OPTIONS):
+            continue
+        for other_name, other_info in indexes.existing.items():
+            if other_name == name or "partialFilterExpression" in other_info or not is_prefix(info["key"], other_info["key"]):
+                continue
+            if info["key"] == other_info["key"] and name > other_name and not any(option in other_info for option in CONSTRAINT_OPTIONS):
+                continue
+            redundant.add(name)
+            add("redundant", name, info["key"], f"prefix of {other_name}, which can serve the same queries")
+            break
+
+    for name, info in indexes.existing.items():
+        if name == "_id_" or name in redundant or any(option in info for option in ("unique", "expireAfterSeconds")):
+            continue
+        ops = indexes.accesses.get(name)
+        if ops is not None and ops <= min_ops:
+            add("unused", name, info["key"], f"{ops} operations since the last restart")
+
+    for name, info in indexes.existing.items():
+        if name not in indexes.declared:
+            add("undeclared", name, info["key"], "exists in the database but is not declared on the entity")
+
+    for name, key in indexes.declared.items():
+        if name not in indexes.existing:
+            add("not_created", name, key, "declared on the entity but missing from the database", estimate_size(indexes, key))
+
+    missing: dict[str, list[str]] = {}
+    missing_keys: dict[str, IndexFields] = {}
+    for entry in shapes:
+        if entry["namespace"] != indexes.namespace or not entry.get("collection_scan"):
+            continue
+        key = candidate_key(entry["shape"])
+        if not key or any(is_prefix(key, info["key"]) for info in indexes.existing.values()):
+            continue
+        name = "_".join(f"{field}_{direction}" for field, direction in key)
+        missing_keys[name] = key
+        missing.setdefault(name, []).append(
+            f"{entry['operation']} {json.dumps(entry['shape'])} (docsExamined={entry.get('docs_examined', 0)}, nReturned={entry.get('n_returned', 0)})",
+        )
+
+    for name, queries in missing.items():
+        add("missing", name, missing_keys[name], "collection scan for " + "; ".join(queries), estimate_size(indexes, missing_keys[name]))
+
+    return findings
+
+
+def format_size(size_bytes: int) -> str:
+    size = float(size_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_report(findings: list[IndexFinding]) -> None:
+    if not findings:
+        print("No index findings.")
+        return
+
+    namespace = None
+    for finding in findings:
+        if finding.namespace != namespace:
+            namespace = finding.namespace
+            print(f"\n{namespace}")
+        print(f"  {finding.kind:<12} {finding.index_name:<32} {format_size(finding.size_bytes):>10}  {finding.detail}")
+
+    reclaimable = sum(finding.size_bytes for finding in findings if finding.kind in ("unused", "redundant"))
+    print(f"\nDropping unused and redundant indexes would free about {format_size(reclaimable)} and remove their write cost.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare declared indexes with $indexStats and the query shape log, and report unused, redundant and missing ones.",
+    )
+    parser.add_argument("collections", nargs="*", help="Collections to check, defaults to every entity collection")
+    parser.add_argument("--shape-log", default=None, help="Query shape log written with MONGODB_QUERY_SHAPE_LOG")
+    parser.add_argument("--min-ops", type=int, default=0, help="Report indexes with at most this many operations as unused")
+    parser.add_argument("--json", action="store_true", help="Print the findings as JSON")
+    parser.add_argument("--database", default=None, help="Database to check, such as a tenant database; defaults to DATABASE_NAME")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    models = {model.collection_name: model for model in load_entity_models()}
+    collection_names = args.collections or sorted(models)
+    shapes = read_shape_log(args.shape_log or settings.MONGODB_QUERY_SHAPE_LOG)
+
+    client: MongoClient = MongoClient(settings.MONGODB_URL)
+    try:
+        database = client[args.database or settings.DATABASE_NAME]
+        findings: list[IndexFinding] = []
+        for collection_name in collection_names:
+            declared = MongoSetup.declared_indexes(models[collection_name]) if collection_name in models else {}
+            indexes = read_collection_indexes(database[collection_name], declared)
+            findings.extend(analyze(indexes, shapes, args.min_ops))
+    finally:
+        client.close()
+
+    if args.json:
+        print(json.dumps([finding.model_dump() for finding in findings], indent=2))
+    else:
+        print_report(findings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+from typing import Any, Literal
+import uuid
+
+from bson import Binary
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from src.configs.config import get_settings
+from src.configs.logging_config import logger
+from src.utils.mongo_model import public_id
+
+IdRepresentation = Literal["binary", "string"]
+
+TEMP_COLLECTION_SUFFIX = "__id_migration"
+
+
+def convert_id(value: Any, target: IdRepresentation) -> Any:  # noqa: ANN401
+    if target == "string":
+        return public_id(value)
+    if isinstance(value, str):
+        try:
+            return Binary.from_uuid(uuid.UUID(value))
+        except ValueError:
+            return value
+    return value
+
+
+def copy_indexes(source: Collection, target: Collection) -> None:
+    for name, info in source.index_information().items():
+        if name == "_id_":
+            continue
+        options = {key: value for key, value in info.items() if key not in ("key", "v", "ns")}
+        target.create_index(info["key"], name=name, **options)
+
+
+def migrate_collection(
+    database: Database,
+    collection_name: str,
+    target: IdRepresentation,
+    batch_size: int,
+    dry_run: bool,
+) -> None:
+    source = database[collection_name]
+    total = source.count_documents({})
+    convertible = 0
+
+    if dry_run:
+        for doc in source.find({}, {"_id": 1}).batch_size(batch_size):
+            if convert_id(doc["_id"], target) != doc["_id"]:
+                convertible += 1
+        logger.info(f"{collection_name}: {convertible} of {total} ids would be converted to {target}")
+        return
+
+    temp_name = f"{collection_name}{TEMP_COLLECTION_SUFFIX}"
+    database.drop_collection(temp_name)
+    temp = database[temp_name]
+
+    batch: list[dict[str, Any]] = []
+    for doc in source.find({}).batch_size(batch_size):
+        converted_id = convert_id(doc["_id"], target)
+        if converted_id != doc["_id"]:
+            convertible += 1
+        batch.append({**doc, "_id": converted_id})
+        if len(batch) >= batch_size:
+            temp.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        temp.insert_many(batch, ordered=False)
+
+    copied = temp.count_documents({})
+    if copied != total:
+        database.drop_collection(temp_name)
+        raise RuntimeError(f"{collection_name}: copied {copied} of {total} documents, migration aborted")
+
+    copy_indexes(source, temp)
+    temp.rename(collection_name, dropTarget=True)
+    logger.info(f"{collection_name}: converted {convertible} of {total} ids to {target}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rewrite _id values between UUID strings and BSON binary subtype 4. Run with the application stopped.",
+    )
+    parser.add_argument("collections", nargs="+", help="Collections to migrate")
+    parser.add_argument("--to", choices=["binary", "string"], default="binary", dest="target")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Only count the ids that would change")
+    parser.add_argument("--database", default=None, help="Database to migrate, such as a tenant database; defaults to DATABASE_NAME")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    client: MongoClient = MongoClient(settings.MONGODB_URL)
+    try:
+        database = client[args.database or settings.DATABASE_NAME]
+        for collection_name in args.collections:
+            migrate_collection(database, collection_name, args.target, args.batch_size, args.dry_run)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
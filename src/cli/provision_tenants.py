@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+
+from src.cli.index_advisor import load_entity_models
+from src.configs.database_config import MongoDB
+from src.configs.logging_config import logger
+from src.utils.mongo_setup import MongoSetup
+from src.utils.tenant_context import configured_tenants, tenant_database_name, validate_tenant
+
+
+async def provision(tenant_ids: list[str]) -> None:
+    load_entity_models()
+    try:
+        for tenant_id in tenant_ids:
+            database_name = tenant_database_name(validate_tenant(tenant_id))
+            logger.info(f"Provisioning tenant {tenant_id} in {database_name}")
+            await MongoSetup()._ensure_collections_exist(MongoDB.get_database(database_name), tenant_scoped_only=True)
+    finally:
+        await MongoDB.close_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create the collections and indexes of tenant databases, rebuild indexes that differ from the entities and backfill search keys.",
+    )
+    parser.add_argument("tenants", nargs="*", help="Tenant ids to provision, defaults to every tenant in TENANT_IDS")
+    args = parser.parse_args()
+    asyncio.run(provision(args.tenants or configured_tenants()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from functools import lru_cache
 from typing import Literal, Self
 
-from pydantic import computed_field
+from pydantic import computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,6 +10,9 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "test"
+    MONGODB_DRIVER: Literal["motor", "pymongo"] = "motor"
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_MIN_POOL_SIZE: int = 10
     JWT_PRIVATE_KEY_PATH: str = "private.pem"
     JWT_PUBLIC_KEY_PATH: str = "public.pem"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
@@ -17,9 +20,45 @@ class Settings(BaseSettings):
     CORS_ORIGINS: str = "http://localhost:3000"
     API_PREFIX: str = "/api"
     ENVIRONMENT: Literal["developer", "production"] = "developer"
+    MONGODB_QUERY_DIAGNOSTICS: bool = False
+    MONGODB_QUERY_SHAPE_LOG: str | None = None
+    MONGODB_SCATTER_GATHER_POLICY: Literal["ignore", "warn", "strict"] = "warn"
+    MONGODB_ROUND_TRIP_TRACKING: bool = False
+    REPOSITORY_CACHE_ENABLED: bool = False
+    WRITE_BEHIND_QUEUE_SIZE: int = 10000
+    WRITE_BEHIND_BATCH_SIZE: int = 500
+    WRITE_BEHIND_FLUSH_INTERVAL_SECONDS: float = 1.0
+    WRITE_BEHIND_OVERFLOW_POLICY: Literal["drop", "block"] = "drop"
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 10.0
+    REQUEST_TIMEOUT_MS: int = 10000
+    REQUEST_TIMEOUT_MAX_MS: int = 30000
+    REQUEST_TIMEOUT_HEADER: str = "X-Request-Timeout-Ms"
+    EMAIL_DELIVERABILITY_CHECK: bool = False
+    EMAIL_DNS_TIMEOUT_SECONDS: float = 2.0
+    EMAIL_DOMAIN_CACHE_SIZE: int = 10000
+    EMAIL_DOMAIN_CACHE_TTL_SECONDS: int = 3600
+    EMAIL_DOMAIN_NEGATIVE_TTL_SECONDS: int = 300
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = 5.0
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    WARMUP_ENABLED: bool = True
+    WARMUP_PRELOAD_USERS: int = 0
+    MULTI_TENANT_ENABLED: bool = False
+    TENANT_HEADER: str = "X-Tenant-Id"
+    TENANT_CLAIM: str = "tid"
+    TENANT_DATABASE_PREFIX: str = "tenant_"
+    TENANT_IDS: str = ""
 
     model_config = SettingsConfigDict(env_file=".env")
 
+    @model_validator(mode="after")
+    def check_tenants(self: Self) -> Self:
+        if self.MULTI_TENANT_ENABLED and not any(value.strip() for value in self.TENANT_IDS.split(",")):
+            raise ValueError("MULTI_TENANT_ENABLED requires TENANT_IDS, the comma-separated list of tenants")
+        return self
+
     @computed_field
     def JWT_PRIVATE_KEY(self: Self) -> str:  # noqa: N802
         try:
@@ -0,0 +1,139 @@
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from enum import Enum
+import inspect
+from typing import Any, Self, TypeVar, cast, get_type_hints
+
+from fastapi import Depends, Request
+
+from src.configs.warmup_config import Warmup
+from src.repositories.revoked_token_repository import RevokedTokenRepository
+from src.repositories.user_repository import UserRepository
+from src.services.auth_service import AuthService
+from src.services.jwt_service import JwtService
+from src.services.token_revocation_service import TokenRevocationService
+from src.services.user_service import UserService
+from src.utils.mongo_health import MongoHealthMonitor
+from src.utils.profiler import RequestProfileStore, StackSampler
+from src.utils.validators import EmailDeliverabilityChecker
+from src.utils.write_behind import WriteBehindBuffer
+
+T = TypeVar("T")
+
+REQUEST_INSTANCES_KEY = "container_instances"
+
+
+class Scope(str, Enum):
+    SINGLETON = "singleton"
+    REQUEST = "request"
+
+
+class Provider:
+    def __init__(self, factory: Callable[..., Any], scope: Scope) -> None:
+        self.factory = factory
+        self.scope = scope
+
+
+class Container:
+    def __init__(self: Self) -> None:
+        self._providers: dict[type, Provider] = {}
+        self._overrides: dict[type, Provider] = {}
+        self._singletons: dict[type, Any] = {}
+
+    def register(
+        self: Self,
+        interface: type[T],
+        implementation: Callable[..., T] | None = None,
+        scope: Scope = Scope.SINGLETON,
+    ) -> None:
+        self._providers[interface] = Provider(implementation or interface, scope)
+
+    @contextmanager
+    def override(self: Self, interface: type[T], implementation: T | Callable[..., T]) -> Iterator[None]:
+        provider = self._providers.get(interface)
+        scope = provider.scope if provider else Scope.SINGLETON
+        factory = implementation if inspect.isclass(implementation) or inspect.isfunction(implementation) else (lambda: implementation)
+
+        self._overrides[interface] = Provider(factory, scope)
+        self._singletons.pop(interface, None)
+        try:
+            yield
+        finally:
+            self._overrides.pop(interface, None)
+            self._singletons.pop(interface, None)
+
+    def resolve(self: Self, interface: type[T], request: Request | None = None) -> T:
+        provider = self._overrides.get(interface) or self._providers.get(interface)
+        if provider is None:
+            raise LookupError(f"No provider registered for {interface.__name__}")
+
+        if provider.scope is Scope.SINGLETON:
+            if interface not in self._singletons:
+                self._singletons[interface] = self._create(provider, request)
+            return cast(T, self._singletons[interface])
+
+        if request is None:
+            raise LookupError(f"{interface.__name__} is request scoped and needs a request to resolve")
+
+        instances: dict[type, Any] = request.scope.setdefault(REQUEST_INSTANCES_KEY, {})
+        if interface not in instances:
+            instances[interface] = self._create(provider, request)
+        return cast(T, instances[interface])
+
+    def _create(self: Self, provider: Provider, request: Request | None) -> Any:  # noqa: ANN401
+        factory = provider.factory
+        try:
+            type_hints = get_type_hints(factory.__init__ if inspect.isclass(factory) else factory)
+        except TypeError:
+            type_hints = {}
+
+        kwargs: dict[str, Any] = {}
+        for name, parameter in inspect.signature(factory).parameters.items():
+            if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+                continue
+            dependency = type_hints.get(name)
+            if dependency in self._providers or dependency in self._overrides:
+                kwargs[name] = self.resolve(dependency, request)
+            elif parameter.default is inspect.Parameter.empty:
+                raise LookupError(f"Cannot resolve parameter '{name}' of {getattr(factory, '__name__', factory)}")
+
+        return factory(**kwargs)
+
+    def build_singletons(self: Self) -> None:
+        for interface, provider in self._providers.items():
+            if provider.scope is Scope.SINGLETON:
+                self.resolve(interface)
+
+    def reset(self: Self) -> None:
+        self._singletons.clear()
+
+
+container = Container()
+container.register(MongoHealthMonitor, MongoHealthMonitor.from_settings)
+container.register(StackSampler)
+container.register(RequestProfileStore)
+container.register(EmailDeliverabilityChecker, EmailDeliverabilityChecker.from_settings)
+container.register(WriteBehindBuffer, WriteBehindBuffer.from_settings)
+container.register(JwtService)
+container.register(UserRepository)
+container.register(RevokedTokenRepository)
+container.register(TokenRevocationService, TokenRevocationService.from_settings)
+container.register(UserService)
+container.register(AuthService)
+container.register(Warmup)
+
+
+def _dependency(interface: type[T]) -> Callable[[Request], Awaitable[T]]:
+    async def provide(request: Request) -> T:
+        return container.resolve(interface, request)
+
+    return provide
+
+
+_dependencies: dict[type, Callable[[Request], Awaitable[Any]]] = {}
+
+
+def inject(interface: type[T]) -> T:
+    if interface not in _dependencies:
+        _dependencies[interface] = _dependency(interface)
+    return cast(T, Depends(_dependencies[interface]))
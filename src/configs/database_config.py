@@ -1,27 +1,71 @@
-from typing import Optional, Self, TypeVar, cast
+import asyncio
+from typing import Any, ClassVar, Literal, Optional, Self, TypeVar, cast
 
-import motor.motor_asyncio
-from motor.motor_asyncio import (
-    AsyncIOMotorClient,
-    AsyncIOMotorCollection,
-    AsyncIOMotorDatabase,
-)
+from pydantic import BaseModel
+from pymongo import read_preferences
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
 
 from src.configs.config import get_settings
 from src.configs.logging_config import logger
+from src.utils.mongo_driver import MongoClient, MongoCollection, MongoDatabase, create_client, resolve
 from src.utils.mongo_model import MongoBaseModel
 from src.utils.mongo_setup import MongoSetup
+from src.utils.round_trips import RoundTripListener
+from src.utils.tenant_context import current_database_name
 
 T = TypeVar("T", bound=MongoBaseModel)
 IndexField = tuple[str, int]
 IndexFields = list[IndexField]
 
+ReadPreferenceMode = Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"]
+ReadConcernLevel = Literal["local", "available", "majority", "linearizable", "snapshot"]
+
+READ_PREFERENCES: dict[str, type] = {
+    "primaryPreferred": read_preferences.PrimaryPreferred,
+    "secondary": read_preferences.Secondary,
+    "secondaryPreferred": read_preferences.SecondaryPreferred,
+    "nearest": read_preferences.Nearest,
+}
+
+
+class CollectionOptions(BaseModel):
+    read_preference: ReadPreferenceMode = "primary"
+    max_staleness_seconds: int = -1
+    read_concern: ReadConcernLevel | None = None
+    write_concern: int | str | None = None
+    journal: bool | None = None
+    wtimeout_ms: int | None = None
+
+    model_config: ClassVar[dict[str, bool]] = {
+        "frozen": True,
+    }
+
+    def to_driver_options(self: Self) -> dict[str, Any]:
+        options: dict[str, Any] = {}
+
+        if self.read_preference == "primary":
+            options["read_preference"] = read_preferences.Primary()
+        else:
+            options["read_preference"] = READ_PREFERENCES[self.read_preference](max_staleness=self.max_staleness_seconds)
+
+        if self.read_concern:
+            options["read_concern"] = ReadConcern(self.read_concern)
+
+        if self.write_concern is not None or self.journal is not None:
+            options["write_concern"] = WriteConcern(w=self.write_concern, wtimeout=self.wtimeout_ms, j=self.journal)
+
+        return options
+
 
 class MongoDB:
     _instance: Optional["MongoDB"] = None
-    _client: AsyncIOMotorClient | None = None
-    _database: AsyncIOMotorDatabase | None = None
+    _client: MongoClient | None = None
     _initialized: bool = False
+    _databases: ClassVar[dict[str, MongoDatabase]] = {}
+    _collections: ClassVar[dict[tuple[str, str, CollectionOptions | None], MongoCollection]] = {}
+    _ready_databases: ClassVar[set[str]] = set()
+    _setup_locks: ClassVar[dict[str, asyncio.Lock]] = {}
 
     def __new__(cls: type[Self]) -> "MongoDB":
         if cls._instance is None:
@@ -35,20 +79,46 @@ class MongoDB:
             return
 
         settings = get_settings()
-        cls._client = motor.motor_asyncio.AsyncIOMotorClient(settings.MONGODB_URL)
-        cls._database = cls._client[settings.DATABASE_NAME]
-        logger.info(f"Connected to MongoDB success, database: {settings.DATABASE_NAME}")
+        cls._client = create_client(
+            settings.MONGODB_DRIVER,
+            settings.MONGODB_URL,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            event_listeners=[RoundTripListener()] if settings.MONGODB_ROUND_TRIP_TRACKING else [],
+        )
+        logger.info(f"Connected to MongoDB success, database: {settings.DATABASE_NAME}, driver: {settings.MONGODB_DRIVER}")
         cls._initialized = True
 
     @classmethod
-    def get_database(cls: type[Self]) -> AsyncIOMotorDatabase:
-        if cls._database is None:
+    def get_client(cls: type[Self]) -> MongoClient:
+        if cls._client is None:
             cls._connect()
-        return cast(AsyncIOMotorDatabase, cls._database)
+        return cast(MongoClient, cls._client)
 
     @classmethod
-    def get_collection(cls: type[Self], collection_name: str) -> AsyncIOMotorCollection:
-        return cls.get_database()[collection_name]
+    def get_database(cls: type[Self], database_name: str | None = None) -> MongoDatabase:
+        # Every tenant database shares the one client, and so the one connection pool.
+        name = database_name or current_database_name()
+        database = cls._databases.get(name)
+        if database is None:
+            database = cls.get_client()[name]
+            cls._databases[name] = database
+        return database
+
+    @classmethod
+    def get_collection(
+        cls: type[Self],
+        collection_name: str,
+        options: CollectionOptions | None = None,
+        database_name: str | None = None,
+    ) -> MongoCollection:
+        key = (database_name or current_database_name(), collection_name, options)
+        collection = cls._collections.get(key)
+        if collection is None:
+            driver_options = options.to_driver_options() if options else {}
+            collection = cls.get_database(key[0]).get_collection(collection_name, **driver_options)
+            cls._collections[key] = collection
+        return collection
 
     @classmethod
     async def ping(cls: type[Self]) -> bool:
@@ -63,15 +133,42 @@ class MongoDB:
         else:
             return True
 
+    @classmethod
+    async def open_connections(cls: type[Self], count: int) -> None:
+        client = cls.get_client()
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(count)))
+
     @classmethod
     async def close_connection(cls: type[Self]) -> None:
         if cls._client:
-            cls._client.close()
+            await resolve(cls._client.close())
             cls._client = None
-            cls._database = None
+            cls._databases.clear()
+            cls._collections.clear()
+            cls._ready_databases.clear()
+            cls._setup_locks.clear()
             cls._initialized = False
             logger.info("MongoDB connection closed")
 
     @classmethod
     async def ensure_collections(cls: type[Self]) -> None:
-        await MongoSetup()._ensure_collections_exist(cls.get_database())
+        database_name = get_settings().DATABASE_NAME
+        await MongoSetup()._ensure_collections_exist(cls.get_database(database_name))
+        cls._ready_databases.add(database_name)
+
+    @classmethod
+    def is_ready(cls: type[Self], database_name: str) -> bool:
+        return database_name in cls._ready_databases
+
+    @classmethod
+    async def ensure_database(cls: type[Self], database_name: str) -> None:
+        if database_name in cls._ready_databases:
+            return
+
+        async with cls._setup_locks.setdefault(database_name, asyncio.Lock()):
+            if database_name in cls._ready_databases:
+                return
+            # Runs inside a request, so it only fills in what is missing; src.cli.provision_tenants rebuilds and backfills.
+            logger.info(f"Checking tenant database {database_name} on first use")
+            await MongoSetup()._ensure_collections_exist(cls.get_database(database_name), tenant_scoped_only=True, reconcile=False)
+            cls._ready_databases.add(database_name)
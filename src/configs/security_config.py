@@ -1,108 +1,85 @@
-from collections.abc import Callable
-from functools import wraps
-from typing import ParamSpec, Self, TypeVar, cast, overload
+from collections.abc import Awaitable, Callable
+from typing import cast
 
-from fastapi import Request
+from fastapi import Depends, Request, Security
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from starlette.datastructures import State
 
+from src.configs.config import get_settings
+from src.configs.container_config import container
 from src.entities.user_entity import RoleUser
 from src.exceptions.forbidden_error import ForbiddenError
 from src.exceptions.unauthorized_error import UnauthorizedError
 from src.models.user_model import UserResponse
 from src.repositories.user_repository import UserRepository
 from src.services.jwt_service import JwtService
+from src.services.token_revocation_service import TokenRevocationService
+from src.utils.tenant_context import current_tenant, set_tenant, validate_tenant
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
-jwt_service = JwtService()
-user_repository = UserRepository()
-
-T = TypeVar("T")
-P = ParamSpec("P")
-
-
-class SecureState(State):
-    def __init__(self: Self) -> None:
-        super().__init__()
-        self.current_user: UserResponse | None = None
+settings = get_settings()
 
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-class SecureRequest(Request):
-    @property
-    def state(self: Self) -> SecureState:
-        if not hasattr(self, "_state"):
-            self._state = SecureState()
-        return self._state
+UserDependency = Callable[..., Awaitable[UserResponse]]
 
 
-@overload
-def jwt_secured(func: Callable[P, T]) -> Callable[P, T]:
-    ...
+def _bind_token_tenant(payload: dict) -> None:
+    token_tenant = payload.get(settings.TENANT_CLAIM)
+    request_tenant = current_tenant()
+    if request_tenant is None and token_tenant is not None:
+        set_tenant(validate_tenant(token_tenant))
+    elif token_tenant != request_tenant:
+        raise ForbiddenError(message="Token was issued for another tenant")
 
 
-@overload
-def jwt_secured(*, role: RoleUser = RoleUser.USER) -> Callable[[Callable[P, T]], Callable[P, T]]:
-    ...
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> UserResponse:
+    current_user: UserResponse | None = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
 
+    try:
+        payload = container.resolve(JwtService).decode_token(token)
+    except JWTError as e:
+        raise UnauthorizedError(message="Invalid token") from e
 
-def jwt_secured(
-    func: Callable[P, T] | None = None,
-    *,
-    role: RoleUser = RoleUser.USER,
-) -> Callable[P, T] | Callable[[Callable[P, T]], Callable[P, T]]:
-    def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        @wraps(func)
-        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            request = kwargs.get("request")
+    user_id = payload.get("uid")
+    # Scoped tokens, such as profile tokens, only grant their scope and are not access tokens.
+    if not user_id or payload.get("scope") is not None:
+        raise UnauthorizedError(message="Invalid token")
 
-            if request is None and args and isinstance(args[0], Request):
-                request = args[0]
+    if settings.MULTI_TENANT_ENABLED:
+        _bind_token_tenant(payload)
 
-            if not isinstance(request, Request):
-                raise TypeError("Request parameter is required and must be of type Request")
+    jti = payload.get("jti")
+    if jti and await container.resolve(TokenRevocationService).is_revoked(jti):
+        raise UnauthorizedError(message="Token has been revoked")
 
-            secure_request = SecureRequest(request.scope, request.receive)
-            token = await oauth2_scheme(request)
+    user = await container.resolve(UserRepository).find_by_id(user_id)
+    if not user:
+        raise UnauthorizedError(message="User not found")
 
-            try:
-                payload = jwt_service.decode_token(token)
-                user_id = payload.get("uid")
-                if not user_id:
-                    raise UnauthorizedError(message="Invalid token")
+    current_user = UserResponse.model_validate(user, from_attributes=True)
+    request.state.current_user = current_user
+    request.state.token_payload = payload
+    return current_user
 
-                user = await user_repository.find_by_id(user_id)
-                if not user:
-                    raise UnauthorizedError(message="User not found")
 
-                if role not in (RoleUser.USER, user.role):
-                    raise ForbiddenError(message=f"Access denied. Required role: {role.value}")
+def _compile_role_check(role: RoleUser) -> UserDependency:
+    if role is RoleUser.USER:
+        return get_current_user
 
-                current_user = UserResponse(
-                    id=user.id,
-                    username=user.username,
-                    email=user.email,
-                    role=user.role,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at,
-                )
+    denied_message = f"Access denied. Required role: {role.value}"
 
-                secure_request.state.current_user = current_user
+    async def check_role(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+        if current_user.role is not role:
+            raise ForbiddenError(message=denied_message)
+        return current_user
 
-                if args and isinstance(args[0], Request):
-                    args_list = list(args)
-                    args_list[0] = secure_request
-                    args = tuple(args_list)
-                elif "request" in kwargs:
-                    kwargs["request"] = secure_request
+    return check_role
 
-                return await func(*args, **kwargs)
 
-            except JWTError as e:
-                raise UnauthorizedError(message="Invalid token") from e
+_role_dependencies: dict[RoleUser, UserDependency] = {role: _compile_role_check(role) for role in RoleUser}
 
-        return cast(Callable[P, T], wrapper)
 
-    if func is None:
-        return decorator
-    return decorator(func)
+def jwt_secured(role: RoleUser = RoleUser.USER) -> UserResponse:
+    return cast(UserResponse, Security(_role_dependencies[role]))
@@ -0,0 +1,78 @@
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import time
+from typing import Any, Self
+
+from pydantic import BaseModel
+
+from src.configs.config import get_settings
+from src.configs.database_config import MongoDB
+from src.configs.logging_config import logger
+from src.entities.user_entity import UserEntity
+from src.models.auth_model import TokenResponse
+from src.models.user_model import UserResponse, UserSearchResponse
+from src.repositories.user_repository import UserRepository
+from src.services.jwt_service import JwtService
+from src.utils.data_pagination import PaginatedResponse
+
+
+class WarmupReport(BaseModel):
+    total_ms: float = 0.0
+    steps: dict[str, float] = {}
+    errors: dict[str, str] = {}
+
+
+class Warmup:
+    def __init__(self: Self, jwt_service: JwtService, user_repository: UserRepository) -> None:
+        self.jwt_service = jwt_service
+        self.user_repository = user_repository
+
+    async def _connections(self: Self) -> None:
+        await MongoDB.open_connections(get_settings().MONGODB_MIN_POOL_SIZE)
+
+    async def _keys(self: Self) -> None:
+        _ = self.jwt_service.private_key, self.jwt_service.public_key
+
+    async def _models(self: Self) -> None:
+        now = datetime.now(UTC)
+        user = UserEntity(username="warmup", email="warmup@example.com", created_at=now, updated_at=now)
+        user.dict_for_db()
+        response = UserResponse.model_validate(user, from_attributes=True)
+        UserSearchResponse.model_validate(user, from_attributes=True).model_dump_json()
+        page = PaginatedResponse[UserResponse](data=[response], page=1, limit=1, total=1, total_pages=1)
+        PaginatedResponse[UserResponse].model_validate(page.model_dump()).model_dump_json()
+        TokenResponse(access_token="warmup", token_type="bearer").model_dump_json()
+
+    async def _jwt(self: Self) -> None:
+        token = self.jwt_service.create_access_token({"sub": "", "uid": "warmup"})
+        self.jwt_service.decode_token(token)
+
+    async def _cache(self: Self) -> None:
+        limit = get_settings().WARMUP_PRELOAD_USERS
+        if limit > 0 and self.user_repository.cache is not None:
+            await self.user_repository.find_by_ids(await self.user_repository.find_recently_active_ids(limit))
+
+    async def run(self: Self) -> WarmupReport:
+        report = WarmupReport()
+        steps: dict[str, Callable[[], Awaitable[Any]]] = {
+            "connections": self._connections,
+            "keys": self._keys,
+            "models": self._models,
+            "jwt": self._jwt,
+            "cache": self._cache,
+        }
+
+        started = time.perf_counter()
+        for name, step in steps.items():
+            step_started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                report.errors[name] = str(e)
+                logger.warning(f"Warm-up step {name} failed: {e}")
+            report.steps[name] = round((time.perf_counter() - step_started) * 1000, 2)
+        report.total_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        details = ", ".join(f"{name}={elapsed}ms" for name, elapsed in report.steps.items())
+        logger.info(f"Warm-up completed in {report.total_ms}ms ({details})")
+        return report
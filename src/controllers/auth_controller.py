@@ -1,6 +1,7 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, status
 
-from src.configs.security_config import SecureRequest, jwt_secured
+from src.configs.container_config import inject
+from src.configs.security_config import jwt_secured
 from src.dtos.auth_dto import LoginRequest, RegisterRequest
 from src.models.auth_model import TokenResponse
 from src.models.user_model import UserResponse
@@ -10,16 +11,20 @@ router = APIRouter(prefix="/auth")
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: RegisterRequest) -> UserResponse:
-    return await AuthService().register(user_data)
+async def register(user_data: RegisterRequest, auth_service: AuthService = inject(AuthService)) -> UserResponse:
+    return await auth_service.register(user_data)
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(user_data: LoginRequest) -> TokenResponse:
-    return await AuthService().login(user_data.username, user_data.password)
+async def login(user_data: LoginRequest, auth_service: AuthService = inject(AuthService)) -> TokenResponse:
+    return await auth_service.login(user_data.username, user_data.password)
 
 
 @router.get("/me", response_model=UserResponse)
-@jwt_secured
-async def get_me(request: SecureRequest) -> UserResponse:
-    return request.state.current_user
+async def get_me(current_user: UserResponse = jwt_secured()) -> UserResponse:
+    return current_user
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, dependencies=[jwt_secured()])
+async def logout(request: Request, auth_service: AuthService = inject(AuthService)) -> None:
+    await auth_service.logout(request.state.token_payload)
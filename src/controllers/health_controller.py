@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from src.configs.container_config import inject
+from src.utils.mongo_health import HealthStatus, MongoHealthMonitor
+
+router = APIRouter(prefix="/health")
+
+
+@router.get("/live")
+async def live() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=HealthStatus)
+async def ready(monitor: MongoHealthMonitor = inject(MongoHealthMonitor)) -> HealthStatus | JSONResponse:
+    health_status = monitor.status
+    if not health_status.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=health_status.model_dump(mode="json"),
+        )
+    return health_status
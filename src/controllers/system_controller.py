@@ -0,0 +1,63 @@
+import asyncio
+from datetime import timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from src.configs.container_config import inject
+from src.configs.security_config import jwt_secured
+from src.entities.user_entity import RoleUser
+from src.exceptions.notfound_error import NotFoundError
+from src.middlewares.request_profiling_middleware import PROFILE_SCOPE
+from src.models.profile_model import ProfileTokenResponse
+from src.models.user_model import UserResponse
+from src.services.jwt_service import JwtService
+from src.utils.profiler import RequestProfileStore, StackSampler
+from src.utils.write_behind import WriteBehindBuffer, WriteBehindMetrics
+
+router = APIRouter(prefix="/system")
+
+
+@router.get("/write-behind", response_model=WriteBehindMetrics, dependencies=[jwt_secured(role=RoleUser.ADMIN)])
+async def get_write_behind_metrics(write_behind: WriteBehindBuffer = inject(WriteBehindBuffer)) -> WriteBehindMetrics:
+    return write_behind.metrics
+
+
+@router.get("/profile", dependencies=[jwt_secured(role=RoleUser.ADMIN)])
+async def sample_profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: int = Query(10, ge=1, le=1000),
+    output: Literal["collapsed", "speedscope"] = Query("collapsed", alias="format"),
+    sampler: StackSampler = inject(StackSampler),
+) -> Response:
+    profile = await asyncio.to_thread(sampler.sample, seconds, interval_ms / 1000)
+    if output == "speedscope":
+        return JSONResponse(profile.to_speedscope())
+    return PlainTextResponse(profile.to_collapsed())
+
+
+@router.post("/profile/token", response_model=ProfileTokenResponse)
+async def create_profile_token(
+    ttl_seconds: int = Query(300, ge=1, le=3600),
+    current_user: UserResponse = jwt_secured(role=RoleUser.ADMIN),
+    jwt_service: JwtService = inject(JwtService),
+) -> ProfileTokenResponse:
+    token = jwt_service.create_access_token(
+        {"sub": current_user.username, "uid": current_user.id, "scope": PROFILE_SCOPE},
+        expires_delta=timedelta(seconds=ttl_seconds),
+    )
+    return ProfileTokenResponse(profile_token=token, header="X-Profile-Token", expires_in=ttl_seconds)
+
+
+@router.get("/profiles", response_model=list[str], dependencies=[jwt_secured(role=RoleUser.ADMIN)])
+async def list_request_profiles(store: RequestProfileStore = inject(RequestProfileStore)) -> list[str]:
+    return store.ids()
+
+
+@router.get("/profiles/{profile_id}", dependencies=[jwt_secured(role=RoleUser.ADMIN)])
+async def get_request_profile(profile_id: str, store: RequestProfileStore = inject(RequestProfileStore)) -> PlainTextResponse:
+    profile = store.get(profile_id)
+    if profile is None:
+        raise NotFoundError(f"Profile {profile_id} not found")
+    return PlainTextResponse(profile)
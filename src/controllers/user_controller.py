@@ -1,25 +1,46 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Query
 
-from src.configs.security_config import SecureRequest, jwt_secured
+from src.configs.container_config import inject
+from src.configs.security_config import jwt_secured
+from src.dtos.user_dto import UserListQuery, UserSort
 from src.entities.user_entity import RoleUser
-from src.models.user_model import UserResponse
+from src.models.user_model import UserResponse, UserSearchResponse
 from src.services.user_service import UserService
 from src.utils.data_pagination import PaginatedResponse
+from src.utils.request_deadline import request_timeout
 
 router = APIRouter(prefix="/users")
 
 
-@router.get("", response_model=PaginatedResponse[UserResponse])
-@jwt_secured(role=RoleUser.ADMIN)
+@router.get("", response_model=PaginatedResponse[UserResponse], dependencies=[jwt_secured(role=RoleUser.ADMIN)])
 async def get_users(
-    request: SecureRequest,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    role: RoleUser | None = Query(None),
+    created_after: datetime | None = Query(None),
+    created_before: datetime | None = Query(None),
+    sort: UserSort | None = Query(None),
+    user_service: UserService = inject(UserService),
 ) -> PaginatedResponse[UserResponse]:
-    return await UserService().get_all_users(skip, limit)
+    filters = UserListQuery(role=role, created_after=created_after, created_before=created_before, sort=sort)
+    return await user_service.get_all_users(skip, limit, filters)
+
+
+@router.get(
+    "/search",
+    response_model=list[UserSearchResponse],
+    dependencies=[jwt_secured(role=RoleUser.ADMIN), request_timeout(2000)],
+)
+async def search_users(
+    prefix: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+    user_service: UserService = inject(UserService),
+) -> list[UserSearchResponse]:
+    return await user_service.search_users(prefix, limit)
 
 
-@router.get("/{user_id}", response_model=UserResponse)
-@jwt_secured(role=RoleUser.ADMIN)
-async def get_user(request: SecureRequest, user_id: str) -> UserResponse:
-    return await UserService().get_user_by_id(user_id)
+@router.get("/{user_id}", response_model=UserResponse, dependencies=[jwt_secured(role=RoleUser.ADMIN)])
+async def get_user(user_id: str, user_service: UserService = inject(UserService)) -> UserResponse:
+    return await user_service.get_user_by_id(user_id)
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from src.entities.user_entity import RoleUser
+
+UserSort = Literal["created_at", "-created_at", "username", "-username"]
+
+
+class UserListQuery(BaseModel):
+    role: RoleUser | None = Field(None)
+    created_after: datetime | None = Field(None)
+    created_before: datetime | None = Field(None)
+    sort: UserSort | None = Field(None)
@@ -0,0 +1,14 @@
+from src.utils.mongo_field import MongoField
+from src.utils.mongo_model import MongoBaseModel, collection_name, shard_key
+
+
+@collection_name("login_audits")
+@shard_key("_id", hashed=True)
+class LoginAuditEntity(MongoBaseModel):
+    user_id: str | None = MongoField[str](default=None)()
+    username: str = MongoField[str](default="")()
+    success: bool = MongoField[bool](default=False)()
+    reason: str | None = MongoField[str](default=None)()
+
+
+LoginAuditEntity.add_compound_index(fields=["user_id", "created_at"])
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import ClassVar
+
+from src.utils.mongo_field import MongoField
+from src.utils.mongo_model import MongoBaseModel, collection_name, shard_key
+
+
+@collection_name("revoked_tokens")
+@shard_key("jti")
+class RevokedTokenEntity(MongoBaseModel):
+    jti: str = MongoField[str](default="", unique=True)()
+    user_id: str | None = MongoField[str](default=None)()
+    expires_at: datetime | None = MongoField[datetime](default=None, expire_after_seconds=0)()
+
+    # Token ids are unique across tenants, so one revocation list serves every tenant.
+    tenant_scoped: ClassVar[bool] = False
@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import Enum
 
 from src.utils.mongo_field import MongoField
@@ -16,6 +17,7 @@ class UserEntity(MongoBaseModel):
         unique=True,
         partial=True,
         index=True,
+        search=True,
         max_length=255,
     )()
     password: str | None = MongoField[str](default=None)()
@@ -25,10 +27,16 @@ class UserEntity(MongoBaseModel):
         unique=True,
         partial=True,
         index=True,
+        search=True,
         max_length=255,
     )()
-    role: RoleUser = MongoField[RoleUser](default=RoleUser.USER, index=True)()
+    role: RoleUser = MongoField[RoleUser](default=RoleUser.USER)()
+    last_login_at: datetime | None = MongoField[datetime](default=None, index=True)()
+    failed_login_count: int = MongoField[int](default=0)()
 
 
-UserEntity.add_compound_index(fields=["role", "username"])
+UserEntity.add_compound_index(fields=["role", "username", "_id"])
 UserEntity.add_compound_index(fields=["role", "email"])
+UserEntity.add_compound_index(fields=["role", "created_at", "_id"])
+UserEntity.add_compound_index(fields=["username", "_id"])
+UserEntity.add_compound_index(fields=["created_at", "_id"])
@@ -0,0 +1,10 @@
+from typing import Self
+
+from fastapi import status
+
+from src.exceptions.base_error import BaseError
+
+
+class ConflictError(BaseError):
+    def __init__(self: Self, message: str = "Conflict", code: int = 409):
+        super().__init__(message, code, status.HTTP_409_CONFLICT)
@@ -0,0 +1,10 @@
+from typing import Self
+
+from fastapi import status
+
+from src.exceptions.base_error import BaseError
+
+
+class GatewayTimeoutError(BaseError):
+    def __init__(self: Self, message: str = "Request deadline exceeded", code: int = 504):
+        super().__init__(message, code, status.HTTP_504_GATEWAY_TIMEOUT)
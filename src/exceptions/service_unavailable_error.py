@@ -0,0 +1,10 @@
+from typing import Self
+
+from fastapi import status
+
+from src.exceptions.base_error import BaseError
+
+
+class ServiceUnavailableError(BaseError):
+    def __init__(self: Self, message: str = "Service unavailable", code: int = 503):
+        super().__init__(message, code, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -6,10 +6,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.configs.config import get_settings
+from src.configs.container_config import container
 from src.configs.database_config import MongoDB
-from src.controllers import auth_controller, user_controller
+from src.configs.warmup_config import Warmup
+from src.controllers import auth_controller, health_controller, system_controller, user_controller
 from src.exceptions.base_error import BaseError
+from src.middlewares.request_deadline_middleware import RequestDeadlineMiddleware
+from src.middlewares.request_profiling_middleware import RequestProfilingMiddleware
+from src.middlewares.round_trip_middleware import RoundTripMiddleware
+from src.middlewares.tenant_middleware import TenantMiddleware
+from src.services.token_revocation_service import TokenRevocationService
 from src.utils.banner import Banner
+from src.utils.mongo_health import MongoHealthMonitor
+from src.utils.repository_cache import CacheInvalidationListener
+from src.utils.write_behind import WriteBehindBuffer
 
 settings = get_settings()
 
@@ -18,7 +28,30 @@ settings = get_settings()
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Banner().print_banner()
     await MongoDB().ensure_collections()
+    container.build_singletons()
+    health_monitor = container.resolve(MongoHealthMonitor)
+    await health_monitor.start()
+    token_revocation = container.resolve(TokenRevocationService)
+    await token_revocation.start()
+    write_behind = container.resolve(WriteBehindBuffer)
+    await write_behind.start()
+
+    cache_listener: CacheInvalidationListener | None = None
+    if settings.REPOSITORY_CACHE_ENABLED:
+        cache_listener = CacheInvalidationListener(MongoDB.get_client() if settings.MULTI_TENANT_ENABLED else MongoDB.get_database())
+        await cache_listener.start()
+
+    if settings.WARMUP_ENABLED:
+        app.state.warmup = await container.resolve(Warmup).run()
+
     yield
+
+    await write_behind.stop()
+    if cache_listener:
+        await cache_listener.stop()
+    await token_revocation.stop()
+    await health_monitor.stop()
+    container.reset()
     await MongoDB().close_connection()
 
 
@@ -38,8 +71,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.MONGODB_ROUND_TRIP_TRACKING and settings.ENVIRONMENT == "developer":
+    app.add_middleware(RoundTripMiddleware)
+app.add_middleware(RequestProfilingMiddleware)
+if settings.MULTI_TENANT_ENABLED:
+    app.add_middleware(TenantMiddleware, header_name=settings.TENANT_HEADER)
+app.add_middleware(
+    RequestDeadlineMiddleware,
+    default_timeout_ms=settings.REQUEST_TIMEOUT_MS,
+    max_timeout_ms=settings.REQUEST_TIMEOUT_MAX_MS,
+    header_name=settings.REQUEST_TIMEOUT_HEADER,
+)
+
+app.include_router(health_controller.router, tags=["Health"])
 app.include_router(auth_controller.router, prefix=settings.API_PREFIX, tags=["Authentication"])
 app.include_router(user_controller.router, prefix=settings.API_PREFIX, tags=["Users"])
+app.include_router(system_controller.router, prefix=settings.API_PREFIX, tags=["System"])
 
 
 @app.exception_handler(BaseError)
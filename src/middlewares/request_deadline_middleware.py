@@ -0,0 +1,37 @@
+from typing import Self
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.utils.request_deadline import reset_deadline, set_deadline
+
+
+class RequestDeadlineMiddleware:
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        default_timeout_ms: int = 10000,
+        max_timeout_ms: int = 30000,
+        header_name: str = "X-Request-Timeout-Ms",
+    ) -> None:
+        self.app = app
+        self.default_timeout_ms = default_timeout_ms
+        self.max_timeout_ms = max_timeout_ms
+        self.header_name = header_name
+
+    def _timeout_ms(self: Self, scope: Scope) -> int:
+        header_value = Headers(scope=scope).get(self.header_name)
+        if header_value and header_value.isdigit() and int(header_value) > 0:
+            return min(int(header_value), self.max_timeout_ms)
+        return self.default_timeout_ms
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = set_deadline(self._timeout_ms(scope) / 1000)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
@@ -0,0 +1,123 @@
+from collections.abc import Coroutine, Generator
+import cProfile
+from typing import Any, Self
+import uuid
+
+from jose import JWTError
+from pymongo.errors import PyMongoError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.configs.container_config import container
+from src.configs.logging_config import logger
+from src.entities.user_entity import RoleUser
+from src.exceptions.base_error import BaseError
+from src.repositories.user_repository import UserRepository
+from src.services.jwt_service import JwtService
+from src.services.token_revocation_service import TokenRevocationService
+from src.utils.profiler import RequestProfileStore
+
+PROFILE_SCOPE = "profile"
+
+
+class ProfiledCoroutine:
+    # Steps the coroutine by hand and profiles only while it runs, so other tasks on the event loop stay out of the report.
+    def __init__(self: Self, coroutine: Coroutine[Any, Any, None], profile: cProfile.Profile) -> None:
+        self.coroutine = coroutine
+        self.profile = profile
+
+    def __await__(self: Self) -> Generator[Any, Any, None]:
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            self.profile.enable()
+            try:
+                yielded = self.coroutine.send(value) if error is None else self.coroutine.throw(error)
+            except StopIteration:
+                return
+            finally:
+                self.profile.disable()
+
+            value, error = None, None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                self.coroutine.close()
+                raise
+            except BaseException as e:
+                error = e
+
+
+class RequestProfilingMiddleware:
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        token_header: str = "X-Profile-Token",
+        id_header: str = "X-Profile-Id",
+    ) -> None:
+        self.app = app
+        self.token_header = token_header
+        self.id_header = id_header
+
+    async def _is_authorized(self: Self, token: str) -> bool:
+        try:
+            payload = container.resolve(JwtService).decode_token(token)
+        except JWTError:
+            logger.warning("Ignoring request profiling header with an invalid token")
+            return False
+
+        jti = payload.get("jti")
+        user_id = payload.get("uid")
+        if payload.get("scope") != PROFILE_SCOPE or not jti or not user_id:
+            return False
+
+        # The token outlives the check made when it was issued, so revocation and the issuer's role are checked on every use.
+        try:
+            if await container.resolve(TokenRevocationService).is_revoked(jti):
+                logger.warning("Ignoring request profiling header with a revoked token")
+                return False
+            user = await container.resolve(UserRepository).find_by_id(user_id)
+        except (PyMongoError, BaseError) as e:
+            logger.warning(f"Ignoring request profiling header, the token could not be checked: {e}")
+            return False
+        return user is not None and user.role is RoleUser.ADMIN
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = Headers(scope=scope).get(self.token_header)
+        if not token or not await self._is_authorized(token):
+            await self.app(scope, receive, send)
+            return
+
+        store = container.resolve(RequestProfileStore)
+        if not store.try_acquire():
+            await self.app(scope, receive, send)
+            return
+
+        profile = cProfile.Profile()
+        label = f"{scope['method']} {scope['path']}"
+        # The id is sent with the response headers, so streaming responses carry it too; the report is saved when the body ends.
+        profile_id = uuid.uuid4().hex
+        saved = False
+
+        def save() -> None:
+            nonlocal saved
+            if not saved:
+                saved = True
+                store.save(profile, label, profile_id=profile_id)
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(self.id_header, profile_id)
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                save()
+            await send(message)
+
+        try:
+            await ProfiledCoroutine(self.app(scope, receive, send_with_profile_id), profile)
+        finally:
+            save()
+            store.release()
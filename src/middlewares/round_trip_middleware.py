@@ -0,0 +1,26 @@
+from typing import Self
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.round_trips import track_round_trips
+
+
+class RoundTripMiddleware:
+    def __init__(self: Self, app: ASGIApp, header_name: str = "X-Mongo-Round-Trips") -> None:
+        self.app = app
+        self.header_name = header_name
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_round_trips() as counter:
+
+            async def send_with_count(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append(self.header_name, counter.summary())
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
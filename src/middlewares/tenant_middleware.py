@@ -0,0 +1,34 @@
+from typing import Self
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.exceptions.base_error import BaseError
+from src.utils.tenant_context import reset_tenant, set_tenant, validate_tenant
+
+
+class TenantMiddleware:
+    def __init__(self: Self, app: ASGIApp, header_name: str = "X-Tenant-Id") -> None:
+        self.app = app
+        self.header_name = header_name
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tenant_id = Headers(scope=scope).get(self.header_name)
+        if tenant_id:
+            try:
+                validate_tenant(tenant_id)
+            except BaseError as e:
+                response = JSONResponse(status_code=e.status_code, content={"detail": e.message, "code": e.code})
+                await response(scope, receive, send)
+                return
+
+        token = set_tenant(tenant_id or None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_tenant(token)
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class ProfileTokenResponse(BaseModel):
+    profile_token: str
+    header: str
+    expires_in: int
@@ -12,3 +12,10 @@ class UserResponse(BaseModel):
     role: RoleUser
     created_at: datetime
     updated_at: datetime
+
+
+class UserSearchResponse(BaseModel):
+    id: str
+    username: str | None
+    email: str | None
+    role: RoleUser
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Self
+
+from src.entities.revoked_token_entity import RevokedTokenEntity
+from src.utils.base_repository import BaseRepository
+
+
+class RevokedTokenRepository(BaseRepository[RevokedTokenEntity]):
+    def __init__(self: Self) -> None:
+        super().__init__(RevokedTokenEntity)
+
+    async def find_by_jti(self: Self, jti: str) -> RevokedTokenEntity | None:
+        return await self.find_one_by_filter({"jti": jti})
+
+    async def find_revoked_since(self: Self, since: datetime | None) -> list[RevokedTokenEntity]:
+        if since is None:
+            return await self.find_by_filter({})
+        return await self.find_by_filter({"created_at": {"$gte": since}})
@@ -1,16 +1,63 @@
+from datetime import datetime
 from typing import Self
 
-from src.entities.user_entity import UserEntity
+from src.configs.database_config import CollectionOptions
+from src.entities.user_entity import RoleUser, UserEntity
 from src.utils.base_repository import BaseRepository
+from src.utils.data_pagination import PaginatedResponse
+from src.utils.mongo_model import public_id
+from src.utils.query_builder import QueryBuilder
+from src.utils.repository_cache import RepositoryCacheConfig
+
+LISTING_FIELDS = ["_id", "username", "email", "role", "created_at", "updated_at"]
 
 
 class UserRepository(BaseRepository[UserEntity]):
+    cache_config = RepositoryCacheConfig(max_entries=50_000, max_bytes=32 * 1024 * 1024)
+    collection_options = CollectionOptions(read_preference="primary")
+    listing_options = CollectionOptions(read_preference="secondaryPreferred", max_staleness_seconds=90, read_concern="local")
+
     def __init__(self: Self) -> None:
         super().__init__(UserEntity)
 
     async def find_by_username(self: Self, username: str) -> UserEntity | None:
         return await self.find_one_by_filter({"username": username})
 
+    async def find_page(
+        self: Self,
+        skip: int = 0,
+        limit: int = 100,
+        role: RoleUser | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        sort: str | None = None,
+    ) -> PaginatedResponse[UserEntity]:
+        builder = (
+            QueryBuilder(UserEntity)
+            .where("role", role.value if role else None)
+            .between("created_at", created_after, created_before)
+            .select(LISTING_FIELDS)
+        )
+        if sort:
+            builder.order_by(sort.removeprefix("-"), -1 if sort.startswith("-") else 1)
+        return await self.find_all(skip, limit, query=builder.build())
+
+    async def find_recently_active_ids(self: Self, limit: int) -> list[str]:
+        filter_query = {"last_login_at": {"$ne": None}}
+        await self._observe_query(filter_query, "find_recently_active_ids")
+        docs = await self._run(
+            lambda: self.collection.find(filter_query, {"_id": 1}).sort("last_login_at", -1).limit(limit).to_list(None),
+        )
+        return [str(public_id(doc["_id"])) for doc in docs]
+
+    async def search_by_prefix(self: Self, prefix: str, limit: int = 10) -> list[UserEntity]:
+        return await self.find_by_prefix(
+            fields=["username", "email"],
+            prefix=prefix,
+            limit=limit,
+            projection={"username": 1, "email": 1, "role": 1},
+        )
+
     async def find_by_username_and_email(self: Self, username: str, email: str | None) -> UserEntity | None:
         filter_conditions = [
             {"username": username},
@@ -1,28 +1,43 @@
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Self
 
 import bcrypt
+from pymongo import InsertOne, UpdateOne
 
 from src.configs.config import get_settings
 from src.dtos.auth_dto import RegisterRequest
+from src.entities.login_audit_entity import LoginAuditEntity
 from src.entities.user_entity import UserEntity
-from src.exceptions.badrequest_error import BadRequestError
 from src.exceptions.unauthorized_error import UnauthorizedError
 from src.models.auth_model import TokenResponse
 from src.models.user_model import UserResponse
 from src.repositories.user_repository import UserRepository
 from src.services.jwt_service import JwtService
+from src.services.token_revocation_service import TokenRevocationService
 from src.services.user_service import UserService
-from src.utils.validators import validate_email_format
+from src.utils.tenant_context import current_tenant
+from src.utils.validators import EmailDeliverabilityChecker, validate_email_format
+from src.utils.write_behind import WriteBehindBuffer
 
 settings = get_settings()
 
 
 class AuthService:
-    def __init__(self: Self) -> None:
-        self.user_service = UserService()
-        self.jwt_service = JwtService()
-        self.user_repository = UserRepository()
+    def __init__(
+        self: Self,
+        user_service: UserService,
+        jwt_service: JwtService,
+        user_repository: UserRepository,
+        write_behind: WriteBehindBuffer,
+        email_checker: EmailDeliverabilityChecker,
+        token_revocation: TokenRevocationService,
+    ) -> None:
+        self.user_service = user_service
+        self.jwt_service = jwt_service
+        self.user_repository = user_repository
+        self.write_behind = write_behind
+        self.email_checker = email_checker
+        self.token_revocation = token_revocation
 
     def _hash_password(self: Self, password: str) -> str:
         return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -36,17 +51,41 @@ class AuthService:
             "uid": user.id,
             "email": user.email,
         }
+        tenant_id = current_tenant()
+        if tenant_id is not None:
+            data[settings.TENANT_CLAIM] = tenant_id
         return self.jwt_service.create_access_token(
             data=data,
             expires_delta=expires,
         )
 
+    async def _record_login(self: Self, username: str, user: UserEntity | None, success: bool, reason: str | None = None) -> None:
+        audit = LoginAuditEntity(
+            user_id=user.id if user else None,
+            username=username,
+            success=success,
+            reason=reason,
+        )
+        await self.write_behind.enqueue(LoginAuditEntity.collection_name, InsertOne(audit.dict_for_db()))
+
+        if user is None:
+            return
+
+        if success:
+            update = {"$set": {"last_login_at": audit.created_at, "failed_login_count": 0, "updated_at": datetime.now(UTC)}}
+        else:
+            update = {"$inc": {"failed_login_count": 1}}
+        await self.write_behind.enqueue(UserEntity.collection_name, UpdateOne({"_id": UserEntity.db_id(user.id)}, update), document_id=user.id)
+
+    async def logout(self: Self, token_payload: dict) -> None:
+        jti = token_payload.get("jti")
+        if not jti:
+            return
+        await self.token_revocation.revoke(jti, token_payload.get("uid"), datetime.fromtimestamp(token_payload["exp"], tz=UTC))
+
     async def register(self: Self, register_req: RegisterRequest) -> UserResponse:
         register_req.email = validate_email_format(register_req.email)
-        existing_user = await self.user_repository.find_by_username_and_email(register_req.username, register_req.email)
-        if existing_user:
-            raise BadRequestError("Username or email already exists")
-
+        await self.email_checker.check(register_req.email)
         return await self.user_service.create_user(
             register_req,
             self._hash_password(register_req.password),
@@ -55,15 +94,19 @@ class AuthService:
     async def login(self: Self, username: str, password: str) -> TokenResponse:
         user = await self.user_repository.find_by_username_or_email(username)
         if not user:
+            await self._record_login(username, None, success=False, reason="unknown_user")
             raise UnauthorizedError(message="Incorrect username")
         try:
-            if not self.verify_password(password, user.password):
-                raise UnauthorizedError(message="Incorrect password")
+            password_matches = self.verify_password(password, user.password)
         except Exception as e:
             raise UnauthorizedError(message=f"{e}") from e
+        if not password_matches:
+            await self._record_login(username, user, success=False, reason="invalid_password")
+            raise UnauthorizedError(message="Incorrect password")
 
         access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = self.sign_token(user, access_token_expires)
+        await self._record_login(username, user, success=True)
 
         return TokenResponse(
             access_token=access_token,
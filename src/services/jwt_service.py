@@ -1,15 +1,32 @@
 from datetime import UTC, datetime, timedelta
-from typing import Self
+from functools import cached_property
+from typing import TYPE_CHECKING, Self
+import uuid
 
-from jose import jwt
 from jose.constants import ALGORITHMS
 
 from src.configs.config import get_settings
 
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+
 settings = get_settings()
 
 
 class JwtService:
+    @cached_property
+    def private_key(self: Self) -> "Key":
+        # jose pulls in its crypto backend on import, so it is loaded with the first key instead of at startup.
+        from jose import jwk
+
+        return jwk.construct(settings.JWT_PRIVATE_KEY, ALGORITHMS.RS256)
+
+    @cached_property
+    def public_key(self: Self) -> "Key":
+        from jose import jwk
+
+        return jwk.construct(settings.JWT_PUBLIC_KEY, ALGORITHMS.RS256)
+
     def create_access_token(self: Self, data: dict, expires_delta: timedelta | None = None) -> str:
         to_encode = data.copy()
         if expires_delta:
@@ -17,16 +34,21 @@ class JwtService:
         else:
             expire = datetime.now(tz=UTC) + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", uuid.uuid4().hex)
+
+        from jose import jwt
 
         return jwt.encode(
             claims=to_encode,
-            key=settings.JWT_PRIVATE_KEY,
+            key=self.private_key,
             algorithm=ALGORITHMS.RS256,
         )
 
     def decode_token(self: Self, token: str) -> dict:
+        from jose import jwt
+
         return jwt.decode(
             token=token,
-            key=settings.JWT_PUBLIC_KEY,
+            key=self.public_key,
             algorithms=[ALGORITHMS.RS256],
         )
@@ -0,0 +1,109 @@
+import asyncio
+import contextlib
+from datetime import UTC, datetime, timedelta
+from typing import Self
+
+from pymongo.errors import PyMongoError
+
+from src.configs.config import get_settings
+from src.configs.logging_config import logger
+from src.entities.revoked_token_entity import RevokedTokenEntity
+from src.exceptions.badrequest_error import BadRequestError
+from src.exceptions.base_error import BaseError
+from src.repositories.revoked_token_repository import RevokedTokenRepository
+from src.utils.bloom_filter import BloomFilter
+
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class TokenRevocationService:
+    def __init__(
+        self: Self,
+        revoked_token_repository: RevokedTokenRepository,
+        sync_interval_seconds: float = 5.0,
+        bloom_capacity: int = 100000,
+        bloom_error_rate: float = 0.001,
+        default_token_ttl: timedelta = timedelta(minutes=1440),
+    ) -> None:
+        self.revoked_token_repository = revoked_token_repository
+        self.sync_interval_seconds = sync_interval_seconds
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.default_token_ttl = default_token_ttl
+        self._bloom = self._new_bloom()
+        self._revoked: dict[str, datetime] = {}
+        self._last_synced_at: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls, revoked_token_repository: RevokedTokenRepository) -> "TokenRevocationService":
+        settings = get_settings()
+        return cls(
+            revoked_token_repository,
+            sync_interval_seconds=settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+            bloom_capacity=settings.REVOCATION_BLOOM_CAPACITY,
+            bloom_error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+            default_token_ttl=timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+
+    def _new_bloom(self: Self, capacity: int = 0) -> BloomFilter:
+        return BloomFilter(max(capacity, self.bloom_capacity), self.bloom_error_rate)
+
+    def _remember(self: Self, jti: str, expires_at: datetime | None) -> None:
+        if jti not in self._revoked:
+            self._bloom.add(jti)
+        self._revoked[jti] = expires_at or datetime.now(UTC) + self.default_token_ttl
+
+    def _prune(self: Self) -> None:
+        now = datetime.now(UTC)
+        self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+        stale_count = self._bloom.count - len(self._revoked)
+        if stale_count > self._bloom.capacity // 2 or self._bloom.count > self._bloom.capacity:
+            self._bloom = self._new_bloom(len(self._revoked) * 2)
+            for jti in self._revoked:
+                self._bloom.add(jti)
+
+    async def sync(self: Self) -> None:
+        started_at = datetime.now(UTC)
+        since = self._last_synced_at - SYNC_OVERLAP if self._last_synced_at else None
+        for revoked in await self.revoked_token_repository.find_revoked_since(since):
+            self._remember(revoked.jti, revoked.expires_at and revoked.expires_at.replace(tzinfo=UTC))
+        self._last_synced_at = started_at
+        self._prune()
+
+    async def start(self: Self) -> None:
+        if self._task is None:
+            await self.sync()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self: Self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self: Self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval_seconds)
+            try:
+                await self.sync()
+            except (PyMongoError, BaseError) as e:
+                logger.warning(f"Token revocation sync failed: {e}")
+
+    async def revoke(self: Self, jti: str, user_id: str | None, expires_at: datetime) -> None:
+        with contextlib.suppress(BadRequestError):
+            await self.revoked_token_repository.create(RevokedTokenEntity(jti=jti, user_id=user_id, expires_at=expires_at))
+        self._remember(jti, expires_at)
+
+    async def is_revoked(self: Self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        if jti in self._revoked:
+            return True
+
+        revoked = await self.revoked_token_repository.find_by_jti(jti)
+        if revoked is None:
+            return False
+        self._remember(jti, revoked.expires_at and revoked.expires_at.replace(tzinfo=UTC))
+        return True
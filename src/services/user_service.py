@@ -1,19 +1,35 @@
 from typing import Self
 
 from src.dtos.auth_dto import RegisterRequest
+from src.dtos.user_dto import UserListQuery
 from src.entities.user_entity import UserEntity
 from src.exceptions.notfound_error import NotFoundError
-from src.models.user_model import UserResponse
+from src.models.user_model import UserResponse, UserSearchResponse
 from src.repositories.user_repository import UserRepository
 from src.utils.data_pagination import PaginatedResponse
 
 
 class UserService:
-    def __init__(self) -> None:
-        self.user_repository = UserRepository()
+    def __init__(self: Self, user_repository: UserRepository) -> None:
+        self.user_repository = user_repository
 
-    async def get_all_users(self: Self, skip: int = 0, limit: int = 100) -> PaginatedResponse:
-        return await self.user_repository.find_all(skip, limit)
+    async def get_all_users(self: Self, skip: int = 0, limit: int = 100, filters: UserListQuery | None = None) -> PaginatedResponse[UserResponse]:
+        filters = filters or UserListQuery()
+        users = await self.user_repository.find_page(
+            skip,
+            limit,
+            role=filters.role,
+            created_after=filters.created_after,
+            created_before=filters.created_before,
+            sort=filters.sort,
+        )
+        return PaginatedResponse[UserResponse](
+            data=[UserResponse.model_validate(user, from_attributes=True) for user in users.data],
+            page=users.page,
+            limit=users.limit,
+            total=users.total,
+            total_pages=users.total_pages,
+        )
 
     async def get_user_by_id(self: Self, id: str) -> UserEntity | None:
         user = await self.user_repository.find_by_id(id)
@@ -23,6 +39,10 @@ class UserService:
             )
         return user
 
+    async def search_users(self: Self, prefix: str, limit: int = 10) -> list[UserSearchResponse]:
+        users = await self.user_repository.search_by_prefix(prefix, limit)
+        return [UserSearchResponse.model_validate(user, from_attributes=True) for user in users]
+
     async def find_by_username(self: Self, username: str) -> UserEntity | None:
         user = await self.user_repository.find_by_username(username)
         if not user:
@@ -1,56 +1,313 @@
-from datetime import UTC, datetime
-from typing import Generic, Self, TypeVar
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import re
+from typing import Any, ClassVar, Generic, Self, TypeVar
 
-from src.configs.database_config import MongoDB
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from src.configs.config import get_settings
+from src.configs.database_config import CollectionOptions, MongoDB
+from src.configs.logging_config import logger
+from src.exceptions.badrequest_error import BadRequestError
+from src.exceptions.conflict_error import ConflictError
+from src.exceptions.gateway_timeout_error import GatewayTimeoutError
+from src.exceptions.internal_error import InternalError
 from src.utils.data_pagination import PaginatedResponse, paginate
-from src.utils.mongo_model import MongoBaseModel
+from src.utils.mongo_driver import MongoCollection
+from src.utils.mongo_health import circuit_breaker
+from src.utils.mongo_model import MongoBaseModel, public_id
+from src.utils.mongo_setup import MongoSetup
+from src.utils.query_builder import IndexedQuery
+from src.utils.query_diagnostics import QueryDiagnostics
+from src.utils.request_deadline import mongo_timeout, remaining_seconds
+from src.utils.tenant_context import current_database_name
+from src.utils.repository_cache import RepositoryCache, RepositoryCacheConfig
 
 T = TypeVar("T", bound=MongoBaseModel)
+R = TypeVar("R")
+
+DUPLICATE_INDEX_PATTERN = re.compile(r"index: (\S+) dup key")
+MAX_CODE_POINT = 0x10FFFF
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    while prefix and ord(prefix[-1]) == MAX_CODE_POINT:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
 
 
 class BaseRepository(Generic[T]):
+    cache_config: ClassVar[RepositoryCacheConfig | None] = None
+    collection_options: ClassVar[CollectionOptions | None] = None
+    listing_options: ClassVar[CollectionOptions | None] = None
+    _scatter_gather_warnings: ClassVar[set[str]] = set()
+
     def __init__(self: Self, entity_class: type[T]) -> None:
         self.entity_class = entity_class
-        self.collection = MongoDB().get_collection(entity_class.collection_name)
+        self.cache_enabled = self.cache_config is not None and get_settings().REPOSITORY_CACHE_ENABLED
 
-    async def find_all(self: Self, skip: int = 0, limit: int = 100) -> PaginatedResponse:
-        return await paginate(self.collection, {}, skip, limit)
+    @property
+    def database_name(self: Self) -> str:
+        if self.entity_class.tenant_scoped:
+            return current_database_name()
+        return get_settings().DATABASE_NAME
 
-    async def find_by_id(self: Self, id: str) -> T | None:
-        doc = await self.collection.find_one({"_id": id})
-        if doc:
-            return self.entity_class(**doc)
-        return None
+    @property
+    def collection(self: Self) -> MongoCollection:
+        return MongoDB.get_collection(self.entity_class.collection_name, self.collection_options, self.database_name)
+
+    @property
+    def cache(self: Self) -> RepositoryCache | None:
+        if not self.cache_enabled or self.cache_config is None:
+            return None
+        # Keyed by namespace, so each tenant database gets its own cache.
+        return RepositoryCache.for_namespace(f"{self.database_name}.{self.entity_class.collection_name}", self.cache_config)
+
+    def _to_entity(self: Self, doc: dict[str, Any]) -> T:
+        entity = self.entity_class.from_db(doc)
+        entity.mark_clean()
+        return entity
+
+    def _duplicate_key_error(self: Self, error: DuplicateKeyError) -> BadRequestError:
+        details: dict[str, Any] = error.details or {}
+        fields: list[str] = list(details.get("keyPattern", {}).keys())
 
-    async def find_by_filter(self: Self, filter_query: dict) -> list[T]:
-        cursor = self.collection.find(filter_query)
-        result = []
-        async for doc in cursor:
-            result.append(self.entity_class(**doc))
-        return result
+        if not fields:
+            match = DUPLICATE_INDEX_PATTERN.search(str(error))
+            if match:
+                fields = MongoSetup.get_unique_indexes(self.entity_class).get(match.group(1), [])
+
+        if not fields:
+            return BadRequestError(f"{self.entity_class.__name__} already exists")
+        return BadRequestError(f"{' and '.join(fields).capitalize()} already exists")
+
+    async def _run(self: Self, operation: Callable[[], Awaitable[R]]) -> R:
+        database_name = self.database_name
+        try:
+            with mongo_timeout():
+                if not MongoDB.is_ready(database_name):
+                    await circuit_breaker.call(lambda: MongoDB.ensure_database(database_name))
+                return await circuit_breaker.call(operation)
+        except PyMongoError as e:
+            if e.timeout and remaining_seconds() is not None:
+                raise GatewayTimeoutError() from e
+            raise
+
+    async def _observe_query(self: Self, filter_query: dict[str, Any], operation: str) -> None:
+        # The explain runs through _run so it honours the circuit breaker and the request deadline.
+        await QueryDiagnostics.observe(self.collection, filter_query, operation, self._run)
+
+    def _check_targeted(self: Self, filter_query: dict[str, Any], operation: str) -> None:
+        shard_key = self.entity_class.shard_key
+        if shard_key is None or shard_key.targets(filter_query):
+            return
+
+        policy = get_settings().MONGODB_SCATTER_GATHER_POLICY
+        if policy == "ignore":
+            return
+
+        collection_name = self.entity_class.collection_name
+        message = (
+            f"{operation} on {collection_name} is scatter-gather: "
+            f"{json.dumps(QueryDiagnostics.query_shape(filter_query))} does not pin the shard key {shard_key.index_name}"
+        )
+        if policy == "strict":
+            raise InternalError(message)
+
+        warning_key = f"{collection_name}:{operation}"
+        if warning_key not in self._scatter_gather_warnings:
+            self._scatter_gather_warnings.add(warning_key)
+            logger.warning(message)
+
+    async def _find_one(
+        self: Self,
+        filter_query: dict[str, Any],
+        operation: str,
+        projection: dict[str, Any] | None = None,
+    ) -> T | None:
+        db_filter = self.entity_class.db_filter(filter_query)
+        self._check_targeted(db_filter, operation)
+        await self._observe_query(db_filter, operation)
+
+        cache = self.cache
+        if cache is None:
+            doc = await self._run(lambda: self.collection.find_one(db_filter, projection))
+        else:
+            key = RepositoryCache.make_key(filter_query, projection)
+            hit, doc = cache.get(key)
+            if not hit:
+                generation = cache.generation
+                doc = await self._run(lambda: self.collection.find_one(db_filter, projection))
+                cache.put(key, doc, RepositoryCache.document_id(filter_query), generation)
 
-    async def find_one_by_filter(self: Self, filter_query: dict) -> T | None:
-        doc = await self.collection.find_one(filter_query)
         if doc:
-            return self.entity_class(**doc)
+            return self._to_entity(doc)
         return None
 
+    def _invalidate(self: Self, id: str, operation: str = "update") -> None:
+        cache = self.cache
+        if cache is not None:
+            cache.invalidate(id, operation)
+
+    def with_options(self: Self, options: CollectionOptions | None) -> MongoCollection:
+        if options is None:
+            return self.collection
+        return MongoDB.get_collection(self.entity_class.collection_name, options, self.database_name)
+
+    async def find_all(
+        self: Self,
+        skip: int = 0,
+        limit: int = 100,
+        options: CollectionOptions | None = None,
+        query: IndexedQuery | None = None,
+    ) -> PaginatedResponse[T]:
+        filter_query = self.entity_class.db_filter(query.filter) if query else {}
+        await self._observe_query(filter_query, "find_all")
+        collection = self.with_options(options or self.listing_options)
+        page = await self._run(
+            lambda: paginate(
+                collection,
+                filter_query,
+                skip,
+                limit,
+                sort=query.sort if query else None,
+                projection=query.projection if query else None,
+                hint=query.hint if query else None,
+            ),
+        )
+        return PaginatedResponse[T](
+            data=[self._to_entity(doc) for doc in page.data],
+            page=page.page,
+            limit=page.limit,
+            total=page.total,
+            total_pages=page.total_pages,
+        )
+
+    async def find_by_id(self: Self, id: str) -> T | None:
+        return await self._find_one({"_id": id}, "find_by_id")
+
+    async def find_by_ids(self: Self, ids: list[str]) -> list[T]:
+        unique_ids = list(dict.fromkeys(ids))
+        docs: dict[str, dict[str, Any] | None] = {}
+
+        cache = self.cache
+        if cache is not None:
+            for id in unique_ids:
+                hit, doc = cache.get(RepositoryCache.make_key({"_id": id}))
+                if hit:
+                    docs[id] = doc
+
+        missing_ids = [id for id in unique_ids if id not in docs]
+        if missing_ids:
+            filter_query = self.entity_class.db_filter({"_id": {"$in": missing_ids}})
+            await self._observe_query(filter_query, "find_by_ids")
+
+            generation = cache.generation if cache is not None else 0
+            for doc in await self._run(lambda: self.collection.find(filter_query).to_list(None)):
+                docs[str(public_id(doc["_id"]))] = doc
+
+            for id in missing_ids:
+                docs.setdefault(id, None)
+                if cache is not None:
+                    cache.put(RepositoryCache.make_key({"_id": id}), docs[id], id, generation)
+
+        return [self._to_entity(doc) for id in unique_ids if (doc := docs[id]) is not None]
+
+    async def find_by_prefix(
+        self: Self,
+        fields: list[str],
+        prefix: str,
+        limit: int = 10,
+        projection: dict[str, Any] | None = None,
+    ) -> list[T]:
+        lower_bound = self.entity_class.normalize_search_value(prefix) or ""
+        upper_bound = prefix_upper_bound(lower_bound)
+        bounds: dict[str, str] = {"$gte": lower_bound}
+        if upper_bound is not None:
+            bounds["$lt"] = upper_bound
+
+        async def find_matches(search_key: str) -> list[dict[str, Any]]:
+            # One sorted range scan per search index, so each returns its first matches in index order.
+            filter_query = {search_key: bounds}
+            await self._observe_query(filter_query, "find_by_prefix")
+            key_projection = {**projection, search_key: 1} if projection else None
+            return await self._run(lambda: self.collection.find(filter_query, key_projection).sort(search_key, 1).limit(limit).to_list(None))
+
+        search_keys = [self.entity_class.search_key(field) for field in fields]
+        matches: dict[str, tuple[tuple[str, str], dict[str, Any]]] = {}
+        for search_key, docs in zip(search_keys, await asyncio.gather(*(find_matches(key) for key in search_keys)), strict=True):
+            for doc in docs:
+                id = str(public_id(doc["_id"]))
+                order = (doc[search_key], id)
+                if id not in matches or order < matches[id][0]:
+                    matches[id] = (order, doc)
+
+        ordered = sorted(matches.values(), key=lambda match: match[0])[:limit]
+        return [self._to_entity(doc) for _, doc in ordered]
+
+    async def find_by_filter(self: Self, filter_query: dict, options: CollectionOptions | None = None) -> list[T]:
+        filter_query = self.entity_class.db_filter(filter_query)
+        await self._observe_query(filter_query, "find_by_filter")
+        docs = await self._run(lambda: self.with_options(options).find(filter_query).to_list(None))
+        return [self._to_entity(doc) for doc in docs]
+
+    async def find_one_by_filter(self: Self, filter_query: dict, projection: dict | None = None) -> T | None:
+        return await self._find_one(filter_query, "find_one_by_filter", projection)
+
     async def create(self: Self, entity: T) -> T:
         entity_dict = entity.dict_for_db()
-        result = await self.collection.insert_one(entity_dict)
-        entity.id = result.inserted_id
+        try:
+            result = await self._run(lambda: self.collection.insert_one(entity_dict))
+        except DuplicateKeyError as e:
+            raise self._duplicate_key_error(e) from e
+        entity.id = str(public_id(result.inserted_id))
+        self._invalidate(entity.id, "insert")
+        entity.created_at = entity_dict["created_at"]
+        entity.updated_at = entity_dict["updated_at"]
+        entity.mark_clean()
         return entity
 
     async def update(self: Self, id: str, entity: T) -> T | None:
-        entity_dict = entity.dict_for_db()
-        entity_dict["updated_at"] = datetime.now(tz=UTC)
+        changes = entity.dirty_for_db()
+        if not changes:
+            return entity
 
-        await self.collection.update_one(
-            {"_id": id},
-            {"$set": entity_dict},
-        )
-        return await self.find_by_id(id)
+        filter_query: dict[str, Any] = {"_id": self.entity_class.db_id(id)}
+        update_query: dict[str, Any] = {"$set": changes}
+
+        version_field = self.entity_class.version_field
+        if version_field:
+            filter_query[version_field] = getattr(entity, version_field)
+            update_query["$inc"] = {version_field: 1}
+
+        self._check_targeted(filter_query, "update")
+        await self._observe_query(filter_query, "update")
+        try:
+            doc = await self._run(
+                lambda: self.collection.find_one_and_update(
+                    filter_query,
+                    update_query,
+                    return_document=ReturnDocument.AFTER,
+                ),
+            )
+        except DuplicateKeyError as e:
+            raise self._duplicate_key_error(e) from e
+        self._invalidate(id)
+        if doc:
+            return self._to_entity(doc)
+
+        if version_field and await self._run(lambda: self.collection.count_documents({"_id": self.entity_class.db_id(id)}, limit=1)):
+            raise ConflictError(f"{self.entity_class.__name__} with ID {id} was modified concurrently")
+        return None
 
     async def delete(self: Self, id: str) -> bool:
-        result = await self.collection.delete_one({"_id": id})
+        filter_query = {"_id": self.entity_class.db_id(id)}
+        self._check_targeted(filter_query, "delete")
+        await self._observe_query(filter_query, "delete")
+        result = await self._run(lambda: self.collection.delete_one(filter_query))
+        self._invalidate(id, "delete")
         return result.deleted_count > 0
@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, Self, TypeVar
+
+from src.utils.base_repository import BaseRepository
+from src.utils.mongo_model import MongoBaseModel
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T", bound=MongoBaseModel)
+
+BatchLoadFunction = Callable[[list[K]], Awaitable[dict[K, V]]]
+
+
+class DataLoader(Generic[K, V]):
+    def __init__(self: Self, batch_load: BatchLoadFunction[K, V]) -> None:
+        self._batch_load = batch_load
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[K] = []
+        self._dispatch_scheduled = False
+        self._batches: set[asyncio.Task] = set()
+
+    def load(self: Self, key: K) -> asyncio.Future[V | None]:
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+        self._queue.append(key)
+
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self: Self, keys: list[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self: Self, key: K | None = None) -> None:
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+    def _dispatch(self: Self) -> None:
+        keys, self._queue = self._queue, []
+        self._dispatch_scheduled = False
+
+        batch = asyncio.create_task(self._run_batch(keys))
+        self._batches.add(batch)
+        batch.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self: Self, keys: list[K]) -> None:
+        try:
+            results = await self._batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                future.set_result(results.get(key))
+
+
+class EntityLoader(DataLoader[str, T]):
+    def __init__(self: Self, repository: BaseRepository[T]) -> None:
+        self.repository = repository
+        super().__init__(self._load_entities)
+
+    async def _load_entities(self: Self, ids: list[str]) -> dict[str, T]:
+        return {entity.id: entity for entity in await self.repository.find_by_ids(ids)}
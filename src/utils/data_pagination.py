@@ -2,9 +2,11 @@ from datetime import datetime
 from math import ceil
 from typing import Any, ClassVar, Generic, TypeVar
 
-from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorCursor
 from pydantic import BaseModel
 
+from src.utils.mongo_driver import MongoCollection, MongoCursor
+from src.utils.mongo_model import public_id
+
 T = TypeVar("T")
 
 MongoValue = str | int | float | bool | datetime | dict[str, Any] | list[Any]
@@ -24,18 +26,26 @@ class PaginatedResponse(BaseModel, Generic[T]):
 
 
 async def paginate(
-    collection: AsyncIOMotorCollection,
+    collection: MongoCollection,
     filter_query: dict[str, MongoValue],
     skip: int = 0,
     limit: int = 100,
+    sort: list[tuple[str, int]] | None = None,
+    projection: dict[str, int] | None = None,
+    hint: str | None = None,
 ) -> PaginatedResponse[MongoDocument]:
-    total: int = await collection.count_documents(filter_query)
-    cursor: AsyncIOMotorCursor = collection.find(filter_query).skip(skip).limit(limit)
+    count_options: dict[str, Any] = {"hint": hint} if hint else {}
+    total: int = await collection.count_documents(filter_query, **count_options)
+    cursor: MongoCursor = collection.find(filter_query, projection).skip(skip).limit(limit)
+    if sort:
+        cursor = cursor.sort(sort)
+    if hint:
+        cursor = cursor.hint(hint)
 
     data: list[MongoDocument] = []
     async for document in cursor:
         if "_id" in document:
-            document["_id"] = str(document["_id"])
+            document["_id"] = str(public_id(document["_id"]))
         data.append(document)
 
     page: int = skip // limit + 1 if limit > 0 else 1
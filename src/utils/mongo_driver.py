@@ -0,0 +1,46 @@
+import inspect
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
+
+T = TypeVar("T")
+
+MongoDriver = Literal["motor", "pymongo"]
+
+# Motor is only imported when it is the configured driver, so at runtime the aliases name the native classes.
+if TYPE_CHECKING:
+    from motor.motor_asyncio import (
+        AsyncIOMotorClient,
+        AsyncIOMotorCollection,
+        AsyncIOMotorCursor,
+        AsyncIOMotorDatabase,
+    )
+
+    MongoClient = AsyncIOMotorClient | AsyncMongoClient
+    MongoDatabase = AsyncIOMotorDatabase | AsyncDatabase
+    MongoCollection = AsyncIOMotorCollection | AsyncCollection
+    MongoCursor = AsyncIOMotorCursor | AsyncCursor
+else:
+    MongoClient = AsyncMongoClient
+    MongoDatabase = AsyncDatabase
+    MongoCollection = AsyncCollection
+    MongoCursor = AsyncCursor
+
+
+def create_client(driver: MongoDriver, url: str, **options: Any) -> MongoClient:  # noqa: ANN401
+    if driver == "pymongo":
+        return AsyncMongoClient(url, **options)
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(url, **options)
+
+
+async def resolve(value: T) -> T:
+    # Motor returns cursors and change streams directly where the native driver returns coroutines.
+    if inspect.isawaitable(value):
+        return await value
+    return value
@@ -20,6 +20,36 @@ class CompoundIndex:
         self.partial = partial
 
 
+class ShardKey:
+    def __init__(self, fields: list[str], hashed: bool = False) -> None:
+        self.fields = fields
+        self.hashed = hashed
+
+    @property
+    def key(self) -> list[tuple[str, int | str]]:
+        if self.hashed:
+            return [(self.fields[0], "hashed"), *((field, 1) for field in self.fields[1:])]
+        return [(field, 1) for field in self.fields]
+
+    @property
+    def index_name(self) -> str:
+        return "_".join(f"{field}_{direction}" for field, direction in self.key)
+
+    def targets(self, filter_query: dict[str, Any]) -> bool:
+        # mongos can route a query to specific shards only when every branch pins the leading shard key field.
+        if "$or" in filter_query:
+            return all(self.targets(branch) for branch in filter_query["$or"])
+        if any(self.targets(branch) for branch in filter_query.get("$and", [])):
+            return True
+
+        value = filter_query.get(self.fields[0])
+        if value is None:
+            return False
+        if not isinstance(value, dict) or "$eq" in value or "$in" in value:
+            return True
+        return not self.hashed and any(operator in value for operator in ("$gt", "$gte", "$lt", "$lte"))
+
+
 class MongoField(Generic[T]):
     def __init__(
         self,
@@ -29,6 +59,8 @@ class MongoField(Generic[T]):
         sparse: bool = False,
         partial: bool = False,
         index: bool = False,
+        search: bool = False,
+        expire_after_seconds: int | None = None,
         **kwargs: dict[str, Any],
     ) -> None:
         self.default = default
@@ -36,6 +68,8 @@ class MongoField(Generic[T]):
         self.sparse = sparse
         self.partial = partial
         self.index = index
+        self.search = search
+        self.expire_after_seconds = expire_after_seconds
         self.field_kwargs = kwargs
 
     def __call__(self) -> FieldInfo:
@@ -44,6 +78,8 @@ class MongoField(Generic[T]):
             "sparse": self.sparse,
             "index": self.index,
             "partial": self.partial,
+            "search": self.search,
+            "expire_after_seconds": self.expire_after_seconds,
         }
         return Field(
             default=self.default,
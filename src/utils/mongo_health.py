@@ -0,0 +1,170 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+from datetime import UTC, datetime
+from enum import Enum
+import time
+from typing import Self, TypeVar
+
+from pydantic import BaseModel
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from src.configs.config import get_settings
+from src.configs.database_config import MongoDB
+from src.configs.logging_config import logger
+from src.exceptions.service_unavailable_error import ServiceUnavailableError
+from src.utils import request_deadline
+
+R = TypeVar("R")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self: Self, failure_threshold: int = 3, reset_timeout_seconds: float = 10.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @classmethod
+    def from_settings(cls) -> "CircuitBreaker":
+        settings = get_settings()
+        return cls(
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout_seconds=settings.CIRCUIT_BREAKER_RESET_SECONDS,
+        )
+
+    def _acquire(self: Self) -> bool:
+        if self.state is CircuitState.CLOSED:
+            return False
+
+        if self.state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state is CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        raise ServiceUnavailableError("Database unavailable")
+
+    def record_success(self: Self) -> None:
+        if self.state is not CircuitState.CLOSED:
+            logger.info("Database circuit closed")
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self: Self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state is CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self: Self) -> None:
+        if self.state is not CircuitState.OPEN:
+            logger.warning("Database circuit opened")
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    async def call(self: Self, operation: Callable[[], Awaitable[R]]) -> R:
+        is_probe = self._acquire()
+        try:
+            result = await operation()
+        except ConnectionFailure as e:
+            if e.timeout and request_deadline.is_expired():
+                if is_probe:
+                    self._probe_in_flight = False
+                raise
+            self.record_failure()
+            raise ServiceUnavailableError("Database unavailable") from e
+        except PyMongoError:
+            self.record_success()
+            raise
+        except BaseException:
+            if is_probe:
+                self._probe_in_flight = False
+            raise
+
+        if is_probe or self.consecutive_failures:
+            self.record_success()
+        return result
+
+
+circuit_breaker = CircuitBreaker.from_settings()
+
+
+class HealthStatus(BaseModel):
+    ready: bool
+    database_up: bool
+    circuit_state: CircuitState
+    rtt_ms: float | None
+    consecutive_failures: int
+    last_checked_at: datetime | None
+
+
+class MongoHealthMonitor:
+    def __init__(self: Self, interval_seconds: float = 5.0, breaker: CircuitBreaker = circuit_breaker) -> None:
+        self.interval_seconds = interval_seconds
+        self.breaker = breaker
+        self.database_up = False
+        self.rtt_ms: float | None = None
+        self.consecutive_failures = 0
+        self.last_checked_at: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls) -> "MongoHealthMonitor":
+        return cls(interval_seconds=get_settings().HEALTH_CHECK_INTERVAL_SECONDS)
+
+    @property
+    def status(self: Self) -> HealthStatus:
+        return HealthStatus(
+            ready=self.database_up and self.breaker.state is not CircuitState.OPEN,
+            database_up=self.database_up,
+            circuit_state=self.breaker.state,
+            rtt_ms=self.rtt_ms,
+            consecutive_failures=self.consecutive_failures,
+            last_checked_at=self.last_checked_at,
+        )
+
+    async def check(self: Self) -> bool:
+        started = time.perf_counter()
+        is_up = await MongoDB.ping()
+        self.last_checked_at = datetime.now(UTC)
+
+        if is_up:
+            self.rtt_ms = (time.perf_counter() - started) * 1000
+            self.consecutive_failures = 0
+            self.breaker.record_success()
+        else:
+            self.rtt_ms = None
+            self.consecutive_failures += 1
+            self.breaker.trip()
+
+        self.database_up = is_up
+        return is_up
+
+    async def start(self: Self) -> None:
+        if self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self: Self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self: Self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.check()
@@ -3,12 +3,17 @@ from datetime import UTC, datetime
 from typing import Any, ClassVar, Self, TypeVar
 import uuid
 
-from pydantic import BaseModel, Field
+from bson import Binary, UuidRepresentation
+from bson.binary import UUID_SUBTYPE
+from pydantic import BaseModel, Field, PrivateAttr
 
-from src.utils.mongo_field import CompoundIndex
+from src.utils.mongo_field import CompoundIndex, ShardKey
 
 T = TypeVar("T", bound="MongoBaseModel")
 
+SEARCH_FIELD_SUFFIX = "_lower"
+ID_OPERATORS = ("$eq", "$ne", "$in", "$nin")
+
 
 def collection_name(name: str) -> Callable[[type[T]], type[T]]:
     def decorator(cls: type[T]) -> type[T]:
@@ -18,6 +23,22 @@ def collection_name(name: str) -> Callable[[type[T]], type[T]]:
     return decorator
 
 
+def shard_key(*fields: str, hashed: bool = False) -> Callable[[type[T]], type[T]]:
+    def decorator(cls: type[T]) -> type[T]:
+        cls.shard_key = ShardKey(list(fields), hashed)
+        return cls
+
+    return decorator
+
+
+def public_id(value: Any) -> Any:  # noqa: ANN401
+    if isinstance(value, Binary) and value.subtype == UUID_SUBTYPE:
+        return str(value.as_uuid(UuidRepresentation.STANDARD))
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
 class MongoBaseModel(BaseModel):
     id: str = Field(alias="_id", default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = Field(alias="created_at", default_factory=lambda: datetime.now(UTC))
@@ -25,6 +46,12 @@ class MongoBaseModel(BaseModel):
 
     collection_name: ClassVar[str] = ""
     compound_indexes: ClassVar[list[CompoundIndex]] = []
+    version_field: ClassVar[str | None] = None
+    binary_id: ClassVar[bool] = False
+    tenant_scoped: ClassVar[bool] = True
+    shard_key: ClassVar[ShardKey | None] = None
+
+    _dirty_fields: set[str] = PrivateAttr(default_factory=set)
 
     model_config: ClassVar[dict[str, bool | dict[type[datetime], Callable[[datetime], str]]]] = {
         "populate_by_name": True,
@@ -34,6 +61,21 @@ class MongoBaseModel(BaseModel):
         },
     }
 
+    def model_post_init(self: Self, context: Any, /) -> None:  # noqa: ANN401, ARG002
+        self._dirty_fields = set(self.model_fields_set)
+
+    def __setattr__(self: Self, name: str, value: Any) -> None:  # noqa: ANN401
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dirty_fields.add(name)
+
+    @property
+    def dirty_fields(self: Self) -> set[str]:
+        return set(self._dirty_fields)
+
+    def mark_clean(self: Self) -> None:
+        self._dirty_fields.clear()
+
     @classmethod
     def add_compound_index(
         cls,
@@ -42,6 +84,8 @@ class MongoBaseModel(BaseModel):
         sparse: bool = False,
         partial: bool = False,
     ) -> None:
+        if "compound_indexes" not in cls.__dict__:
+            cls.compound_indexes = []
         cls.compound_indexes.append(
             CompoundIndex(
                 fields=fields,
@@ -51,21 +95,84 @@ class MongoBaseModel(BaseModel):
             ),
         )
 
+    @classmethod
+    def db_id(cls, id: Any) -> Any:  # noqa: ANN401
+        if not cls.binary_id or not isinstance(id, str):
+            return id
+        try:
+            return Binary.from_uuid(uuid.UUID(id))
+        except ValueError:
+            return id
+
+    @classmethod
+    def db_filter(cls, filter_query: dict[str, Any]) -> dict[str, Any]:
+        if not cls.binary_id or "_id" not in filter_query:
+            return filter_query
+
+        id_filter = filter_query["_id"]
+        if isinstance(id_filter, dict):
+            id_filter = {
+                operator: ([cls.db_id(id) for id in value] if isinstance(value, list) else cls.db_id(value)) if operator in ID_OPERATORS else value
+                for operator, value in id_filter.items()
+            }
+        else:
+            id_filter = cls.db_id(id_filter)
+        return {**filter_query, "_id": id_filter}
+
+    @classmethod
+    def search_fields(cls) -> list[str]:
+        return [
+            field_name
+            for field_name, field_info in cls.model_fields.items()
+            if isinstance(field_info.json_schema_extra, dict) and field_info.json_schema_extra.get("search", False)
+        ]
+
+    @staticmethod
+    def search_key(field_name: str) -> str:
+        return f"{field_name}{SEARCH_FIELD_SUFFIX}"
+
+    @staticmethod
+    def normalize_search_value(value: Any) -> str | None:  # noqa: ANN401
+        return value.lower() if isinstance(value, str) else None
+
+    def _add_search_values(self: Self, data: dict[str, Any], fields: list[str]) -> None:
+        for field_name in fields:
+            data[self.search_key(field_name)] = self.normalize_search_value(getattr(self, field_name))
+
     def dict_for_db(self: Self) -> dict[str, Any]:
         data = self.model_dump(by_alias=True, exclude_unset=False)
+        now = datetime.now(UTC)
 
         created_at = data.pop("created_at", None)
         data.pop("updated_at", None)
 
-        data["created_at"] = created_at if created_at is not None else datetime.now(UTC)
-        data["updated_at"] = datetime.now(UTC)
+        data["created_at"] = created_at if created_at is not None else now
+        data["updated_at"] = now
+        data["_id"] = self.db_id(data["_id"])
+        self._add_search_values(data, self.search_fields())
+
+        return data
 
+    def dirty_for_db(self: Self) -> dict[str, Any]:
+        immutable_fields = {"id", "created_at", "updated_at"}
+        if self.version_field:
+            immutable_fields.add(self.version_field)
+
+        changed_fields = self._dirty_fields - immutable_fields
+        if not changed_fields:
+            return {}
+
+        data = self.model_dump(by_alias=True, include=changed_fields)
+        data["updated_at"] = datetime.now(UTC)
+        self._add_search_values(data, [field_name for field_name in self.search_fields() if field_name in changed_fields])
         return data
 
     @classmethod
     def from_db(cls: type[Self], data: dict[str, Any]) -> Self:
+        # Work on a copy: the document may be shared, for example by the repository cache.
+        data = dict(data)
         if "_id" in data and data["_id"] is not None and not isinstance(data["_id"], str):
-            data["_id"] = str(data["_id"])
+            data["_id"] = str(public_id(data["_id"]))
 
         for field in ["created_at", "updated_at"]:
             if field in data and isinstance(data[field], str):
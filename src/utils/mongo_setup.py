@@ -3,14 +3,20 @@ import inspect
 import sys
 from typing import Any, Self, Union, cast, get_args, get_origin
 
-from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
 
 from src.configs.logging_config import logger
+from src.utils.mongo_driver import MongoCollection, MongoDatabase
 from src.utils.mongo_model import MongoBaseModel
 
-IndexField = tuple[str, int]
+IndexField = tuple[str, int | str]
 IndexFields = list[IndexField]
 
+BASE_INDEX_FIELDS = ["created_at"]
+SEARCH_BACKFILL_BATCH_SIZE = 1000
+INDEX_NOT_FOUND = 27
+
 
 class MongoSetup:
     @classmethod
@@ -26,16 +32,33 @@ class MongoSetup:
                 field_type = "bool"
         return field_type
 
+    @classmethod
+    def get_unique_indexes(cls, model: type[MongoBaseModel]) -> dict[str, list[str]]:
+        unique_indexes: dict[str, list[str]] = {}
+
+        for field_name, field_info in model.model_fields.items():
+            field_extras: dict[str, Any] = getattr(field_info, "json_schema_extra", {}) or {}
+            if isinstance(field_extras, dict) and field_extras.get("unique", False):
+                unique_indexes[f"{field_name}_1"] = [field_name]
+
+        for compound_idx in model.compound_indexes:
+            if compound_idx.unique:
+                index_name: str = "_".join([f"{field}_1" for field in compound_idx.fields])
+                unique_indexes[index_name] = list(compound_idx.fields)
+
+        return unique_indexes
+
     @classmethod
     async def _create_index_with_options(
         cls,
-        collection: AsyncIOMotorCollection,
+        collection: MongoCollection,
         index_fields: IndexFields,
         is_unique: bool = False,
         is_sparse: bool = False,
         partial: bool = False,
         field_type: str = "string",
         index_name: str | None = None,
+        expire_after_seconds: int | None = None,
     ) -> None:
         index_options: dict[str, Any] = {
             "unique": is_unique,
@@ -45,6 +68,9 @@ class MongoSetup:
         if index_name:
             index_options["name"] = index_name
 
+        if expire_after_seconds is not None:
+            index_options["expireAfterSeconds"] = expire_after_seconds
+
         if partial:
             field_name: str = index_fields[0][0] if isinstance(index_fields[0], tuple) else index_fields[0]
             index_options["partialFilterExpression"] = {
@@ -54,11 +80,48 @@ class MongoSetup:
         await collection.create_index(index_fields, **index_options)
 
     @classmethod
-    async def _ensure_collections_exist(cls: type[Self], database: AsyncIOMotorDatabase) -> None:
-        logger.info("Ensuring MongoDB collections exist...")
+    async def _ensure_search_indexes(
+        cls,
+        collection: MongoCollection,
+        model: type[MongoBaseModel],
+        existing_index_names: list[str],
+        backfill: bool = True,
+    ) -> None:
+        for field_name in model.search_fields():
+            search_key: str = model.search_key(field_name)
+            index_name: str = f"{search_key}_1"
+
+            if index_name not in existing_index_names:
+                logger.info(f"Creating search index {index_name} for {model.collection_name}")
+                await collection.create_index([(search_key, 1)], name=index_name)
+
+            if not backfill:
+                continue
+
+            operations: list[UpdateOne] = []
+            cursor = collection.find(
+                {search_key: {"$exists": False}, field_name: {"$type": "string"}},
+                {field_name: 1},
+            )
+            async for document in cursor:
+                operations.append(
+                    UpdateOne(
+                        {"_id": document["_id"]},
+                        {"$set": {search_key: model.normalize_search_value(document[field_name])}},
+                    ),
+                )
+                if len(operations) >= SEARCH_BACKFILL_BATCH_SIZE:
+                    await collection.bulk_write(operations, ordered=False)
+                    operations = []
+
+            if operations:
+                await collection.bulk_write(operations, ordered=False)
+
+    @classmethod
+    def entity_models(cls) -> list[type[MongoBaseModel]]:
         models: list[type[MongoBaseModel]] = []
 
-        for module_name, module in sys.modules.items():
+        for module_name, module in list(sys.modules.items()):
             if module_name.startswith("src.entities"):
                 for _, obj in inspect.getmembers(module):
                     if (
@@ -70,19 +133,151 @@ class MongoSetup:
                     ):
                         models.append(cast(type[MongoBaseModel], obj))
 
+        return models
+
+    @classmethod
+    def base_index_fields(cls, model: type[MongoBaseModel]) -> list[str]:
+        # A compound index that starts with the field serves the same queries, so a single-field index would only add write cost.
+        return [field for field in BASE_INDEX_FIELDS if not any(compound_idx.fields[0] == field for compound_idx in model.compound_indexes)]
+
+    @classmethod
+    def declared_indexes(cls, model: type[MongoBaseModel]) -> dict[str, IndexFields]:
+        indexes: dict[str, IndexFields] = {"_id_": [("_id", 1)]}
+        for field_name in cls.base_index_fields(model):
+            indexes[f"{field_name}_1"] = [(field_name, 1)]
+
+        for field_name, field_info in model.model_fields.items():
+            field_extras: dict[str, Any] = getattr(field_info, "json_schema_extra", {}) or {}
+            if isinstance(field_extras, dict) and (
+                field_extras.get("index", False) or field_extras.get("unique", False) or field_extras.get("expire_after_seconds") is not None
+            ):
+                indexes[f"{field_name}_1"] = [(field_name, 1)]
+
+        for compound_idx in model.compound_indexes:
+            indexes["_".join([f"{field}_1" for field in compound_idx.fields])] = [(field, 1) for field in compound_idx.fields]
+
+        for field_name in model.search_fields():
+            search_key: str = model.search_key(field_name)
+            indexes[f"{search_key}_1"] = [(search_key, 1)]
+
+        if model.shard_key is not None and model.shard_key.key != [("_id", 1)]:
+            indexes[model.shard_key.index_name] = model.shard_key.key
+
+        return indexes
+
+    @classmethod
+    def declared_partial_filters(cls, model: type[MongoBaseModel]) -> dict[str, dict[str, Any]]:
+        partial_filters: dict[str, dict[str, Any]] = {}
+
+        for field_name, field_info in model.model_fields.items():
+            field_extras: dict[str, Any] = getattr(field_info, "json_schema_extra", {}) or {}
+            if not isinstance(field_extras, dict):
+                continue
+
+            annotation: Any = getattr(field_info, "annotation", None)
+            args: tuple[Any, ...] = get_args(annotation)
+            is_optional: bool = get_origin(annotation) is Union and type(None) in args
+            is_unique: bool = field_extras.get("unique", False)
+            is_partial: bool = field_extras.get("partial", False)
+
+            if is_unique and (is_optional or field_extras.get("sparse", False) or is_partial):
+                field_type: str = cls._get_field_type(annotation, args)
+            elif is_partial and field_extras.get("index", False):
+                field_type = "string"
+            else:
+                continue
+            partial_filters[f"{field_name}_1"] = {field_name: {"$exists": True, "$type": field_type}}
+
+        for compound_idx in model.compound_indexes:
+            if compound_idx.partial:
+                first_field: str = compound_idx.fields[0]
+                field_info = model.model_fields.get(first_field)
+                annotation = getattr(field_info, "annotation", None)
+                index_name: str = "_".join([f"{field}_1" for field in compound_idx.fields])
+                partial_filters[index_name] = {first_field: {"$exists": True, "$type": cls._get_field_type(annotation, get_args(annotation))}}
+
+        return partial_filters
+
+    @classmethod
+    def shard_key_conflicts(cls, model: type[MongoBaseModel]) -> list[str]:
+        # A sharded collection can only enforce unique indexes that start with a ranged shard key.
+        if model.shard_key is None:
+            return []
+
+        key_fields = model.shard_key.fields
+        return [
+            index_name
+            for index_name, fields in cls.get_unique_indexes(model).items()
+            if model.shard_key.hashed or fields[: len(key_fields)] != key_fields
+        ]
+
+    @classmethod
+    async def _is_mongos(cls, database: MongoDatabase) -> bool:
+        try:
+            hello: dict[str, Any] = await database.client.admin.command("hello")
+        except PyMongoError as e:
+            logger.warning(f"Could not detect the deployment type, skipping sharding: {e}")
+            return False
+        return hello.get("msg") == "isdbgrid"
+
+    @classmethod
+    async def _ensure_sharding(cls, database: MongoDatabase, model: type[MongoBaseModel]) -> None:
+        shard_key = model.shard_key
+        if shard_key is None:
+            return
+
+        namespace = f"{database.name}.{model.collection_name}"
+        conflicts = cls.shard_key_conflicts(model)
+        if conflicts:
+            logger.error(f"Cannot shard {namespace} on {shard_key.index_name}: unique indexes {', '.join(conflicts)} do not start with the shard key")
+            return
+
+        key_document = dict(shard_key.key)
+        sharded: dict[str, Any] | None = await database.client["config"]["collections"].find_one({"_id": namespace})
+        if sharded is not None and not sharded.get("dropped", False):
+            if dict(sharded["key"]) != key_document:
+                logger.warning(f"{namespace} is already sharded on {dict(sharded['key'])}, not on the declared {key_document}")
+            return
+
+        await database.client.admin.command("enableSharding", database.name)
+        await database.client.admin.command("shardCollection", namespace, key=key_document)
+        logger.info(f"Sharded {namespace} on {key_document}")
+
+    @staticmethod
+    def _index_matches(existing: dict[str, Any], is_unique: bool, is_sparse: bool, partial_filter: dict[str, Any]) -> bool:
+        return (
+            bool(existing.get("unique", False)) == is_unique
+            and bool(existing.get("sparse", False)) == is_sparse
+            and existing.get("partialFilterExpression") == partial_filter
+        )
+
+    @classmethod
+    async def _ensure_collections_exist(
+        cls: type[Self],
+        database: MongoDatabase,
+        tenant_scoped_only: bool = False,
+        reconcile: bool = True,
+    ) -> None:
+        # Without reconcile, only missing collections and indexes are created: nothing is dropped and no documents are backfilled.
+        logger.info("Ensuring MongoDB collections exist...")
+        models = [model for model in cls.entity_models() if model.tenant_scoped or not tenant_scoped_only]
         existing_collections: list[str] = await database.list_collection_names()
+        is_mongos = any(model.shard_key is not None for model in models) and await cls._is_mongos(database)
 
         for model in models:
             if model.collection_name not in existing_collections:
                 logger.info(f"Creating collection: {model.collection_name}")
-                await database.create_collection(model.collection_name)
+                try:
+                    await database.create_collection(model.collection_name)
+                except CollectionInvalid:
+                    logger.info(f"Collection {model.collection_name} was created by another worker")
 
-            collection: AsyncIOMotorCollection = database[model.collection_name]
+            collection: MongoCollection = database[model.collection_name]
 
-            existing_indexes = await collection.list_indexes().to_list(None)
-            existing_index_names: list[str] = [idx.get("name") for idx in existing_indexes]
+            existing_indexes: dict[str, dict[str, Any]] = await collection.index_information()
+            existing_index_names: list[str] = list(existing_indexes)
 
-            for base_field in ["created_at"]:
+            for base_field in cls.base_index_fields(model):
                 index_name: str = f"{base_field}_1"
                 if index_name not in existing_index_names:
                     await collection.create_index(base_field)
@@ -92,14 +287,17 @@ class MongoSetup:
             for field_name, field_info in model_fields.items():
                 field_extras: dict[str, Any] = getattr(field_info, "json_schema_extra", {}) or {}
 
-                if not isinstance(field_extras, dict) or not any(field_extras.get(key, False) for key in ["unique", "index"]):
+                if not isinstance(field_extras, dict) or not (
+                    any(field_extras.get(key, False) for key in ["unique", "index"]) or field_extras.get("expire_after_seconds") is not None
+                ):
                     continue
 
                 index_name: str = f"{field_name}_1"
                 is_unique: bool = field_extras.get("unique", False)
                 is_sparse: bool = field_extras.get("sparse", False)
                 is_partial: bool = field_extras.get("partial", False)
-                needs_index: bool = field_extras.get("index", False) or is_unique
+                expire_after_seconds: int | None = field_extras.get("expire_after_seconds")
+                needs_index: bool = field_extras.get("index", False) or is_unique or expire_after_seconds is not None
 
                 if not needs_index:
                     continue
@@ -115,13 +313,27 @@ class MongoSetup:
                 except (AttributeError, TypeError):
                     pass
 
-                if index_name in existing_index_names and (is_unique and (is_optional or is_sparse or is_partial)):
-                    await collection.drop_index(index_name)
-                    existing_index_names.remove(index_name)
-
                 if is_unique and (is_optional or is_sparse or is_partial):
                     field_type: str = cls._get_field_type(annotation, args)
 
+                    if index_name in existing_indexes:
+                        partial_filter = {field_name: {"$exists": True, "$type": field_type}}
+                        if cls._index_matches(existing_indexes[index_name], True, is_sparse, partial_filter):
+                            continue
+                        if not reconcile:
+                            logger.warning(
+                                f"Index {index_name} on {database.name}.{model.collection_name} differs from its declaration; "
+                                "run python -m src.cli.provision_tenants to rebuild it",
+                            )
+                            continue
+
+                        logger.info(f"Rebuilding index {index_name} for {model.collection_name}")
+                        try:
+                            await collection.drop_index(index_name)
+                        except OperationFailure as e:
+                            if e.code != INDEX_NOT_FOUND:
+                                raise
+
                     await cls._create_index_with_options(
                         collection=collection,
                         index_fields=[(field_name, 1)],
@@ -140,6 +352,7 @@ class MongoSetup:
                         is_sparse=is_sparse,
                         partial=is_partial,
                         index_name=index_name,
+                        expire_after_seconds=expire_after_seconds,
                     )
 
             if hasattr(model, "compound_indexes") and model.compound_indexes:
@@ -184,4 +397,14 @@ class MongoSetup:
                             index_name=index_name,
                         )
 
+            await cls._ensure_search_indexes(collection, model, existing_index_names, backfill=reconcile)
+
+            shard_key = model.shard_key
+            if shard_key is not None and shard_key.key != [("_id", 1)] and shard_key.index_name not in await collection.index_information():
+                logger.info(f"Creating shard key index {shard_key.index_name} for {model.collection_name}")
+                await collection.create_index(shard_key.key, name=shard_key.index_name)
+
+            if is_mongos:
+                await cls._ensure_sharding(database, model)
+
         logger.info("MongoDB collections setup completed.")
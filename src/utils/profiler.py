@@ -0,0 +1,140 @@
+from collections import Counter, OrderedDict
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Self
+import uuid
+
+from src.exceptions.conflict_error import ConflictError
+
+FrameKey = tuple[str, str, int]
+Stack = tuple[FrameKey, ...]
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class SampledProfile:
+    def __init__(self: Self, stacks: Counter[Stack], interval_seconds: float, duration_seconds: float) -> None:
+        self.stacks = stacks
+        self.interval_seconds = interval_seconds
+        self.duration_seconds = duration_seconds
+
+    @property
+    def sample_count(self: Self) -> int:
+        return sum(self.stacks.values())
+
+    @staticmethod
+    def frame_label(frame: FrameKey) -> str:
+        name, filename, line = frame
+        return f"{name} ({filename}:{line})"
+
+    def to_collapsed(self: Self) -> str:
+        lines = [f"{';'.join(self.frame_label(frame) for frame in stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self: Self, name: str = "worker") -> dict[str, Any]:
+        frame_indexes: dict[FrameKey, int] = {}
+        samples: list[list[int]] = []
+        weights: list[float] = []
+
+        for stack, count in self.stacks.items():
+            samples.append([frame_indexes.setdefault(frame, len(frame_indexes)) for frame in stack])
+            weights.append(count * self.interval_seconds)
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "shared": {"frames": [{"name": name_, "file": file, "line": line} for name_, file, line in frame_indexes]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                },
+            ],
+            "name": name,
+            "exporter": "fastapi-app-sampler",
+        }
+
+
+class StackSampler:
+    def __init__(self: Self) -> None:
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stack(thread_name: str, frame: FrameType | None) -> Stack:
+        stack: list[FrameKey] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.append((thread_name, "<thread>", 0))
+        return tuple(reversed(stack))
+
+    def sample(self: Self, duration_seconds: float, interval_seconds: float = 0.01) -> SampledProfile:
+        if not self._lock.acquire(blocking=False):
+            raise ConflictError("A sampling profile is already running")
+
+        try:
+            sampler_thread = threading.get_ident()
+            stacks: Counter[Stack] = Counter()
+            started = time.perf_counter()
+            deadline = started + duration_seconds
+
+            while time.perf_counter() < deadline:
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != sampler_thread:
+                        stacks[self._stack(thread_names.get(thread_id, str(thread_id)), frame)] += 1
+                time.sleep(interval_seconds)
+
+            return SampledProfile(stacks, interval_seconds, time.perf_counter() - started)
+        finally:
+            self._lock.release()
+
+
+class RequestProfileStore:
+    def __init__(self: Self, max_profiles: int = 50) -> None:
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, str] = OrderedDict()
+        self._active = False
+
+    def try_acquire(self: Self) -> bool:
+        if self._active:
+            return False
+        self._active = True
+        return True
+
+    def release(self: Self) -> None:
+        self._active = False
+
+    def save(
+        self: Self,
+        profile: cProfile.Profile,
+        label: str,
+        sort_by: str = "cumulative",
+        limit: int = 50,
+        profile_id: str | None = None,
+    ) -> str:
+        output = io.StringIO()
+        output.write(f"{label}\n")
+        pstats.Stats(profile, stream=output).strip_dirs().sort_stats(sort_by).print_stats(limit)
+
+        profile_id = profile_id or uuid.uuid4().hex
+        self._profiles[profile_id] = output.getvalue()
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self: Self, profile_id: str) -> str | None:
+        return self._profiles.get(profile_id)
+
+    def ids(self: Self) -> list[str]:
+        return list(reversed(self._profiles))
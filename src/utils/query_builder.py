@@ -0,0 +1,111 @@
+from typing import Any, Self
+
+from pydantic import BaseModel
+
+from src.exceptions.badrequest_error import BadRequestError
+from src.utils.mongo_model import MongoBaseModel
+from src.utils.mongo_setup import IndexFields, MongoSetup
+
+
+class IndexedQuery(BaseModel):
+    filter: dict[str, Any]
+    sort: IndexFields
+    projection: dict[str, int] | None
+    hint: str | None
+
+
+class QueryBuilder:
+    def __init__(self: Self, model: type[MongoBaseModel]) -> None:
+        self.model = model
+        self._equality: dict[str, Any] = {}
+        self._ranges: dict[str, dict[str, Any]] = {}
+        self._sort: IndexFields = []
+        self._fields: list[str] | None = None
+
+    def where(self: Self, field: str, value: Any) -> Self:  # noqa: ANN401
+        if value is not None:
+            self._equality[field] = value
+        return self
+
+    def between(self: Self, field: str, lower: Any = None, upper: Any = None) -> Self:  # noqa: ANN401
+        bounds: dict[str, Any] = {}
+        if lower is not None:
+            bounds["$gte"] = lower
+        if upper is not None:
+            bounds["$lt"] = upper
+        if bounds:
+            self._ranges[field] = bounds
+        return self
+
+    def order_by(self: Self, field: str, direction: int = 1) -> Self:
+        self._sort.append((field, direction))
+        return self
+
+    def select(self: Self, fields: list[str]) -> Self:
+        self._fields = fields
+        return self
+
+    def _full_sort(self: Self) -> IndexFields:
+        # Without a unique last key, documents with equal sort values can move between skip/limit pages.
+        if not self._sort or any(field == "_id" for field, _ in self._sort):
+            return list(self._sort)
+        return [*self._sort, ("_id", self._sort[-1][1])]
+
+    def _implies(self: Self, partial_filter: dict[str, Any]) -> bool:
+        # A partial index only holds documents where its fields are set, so only an equality match on them keeps the result unchanged.
+        return all(field in self._equality for field in partial_filter)
+
+    def _supports(self: Self, key: IndexFields, sort: IndexFields) -> bool:
+        # Keys are matched in equality, sort, range order; anything else needs an in-memory sort or wide bounds.
+        fields = [field for field, _ in key]
+        position = len(self._equality)
+        if set(fields[:position]) != set(self._equality):
+            return False
+
+        if sort:
+            index_sort = key[position : position + len(sort)]
+            if [field for field, _ in index_sort] != [field for field, _ in sort]:
+                return False
+            # The index can be walked forwards or backwards, but not both at once.
+            if len({direction * index_direction for (_, direction), (_, index_direction) in zip(sort, index_sort, strict=True)}) > 1:
+                return False
+            position += len(sort)
+
+        sort_fields = {field for field, _ in sort}
+        ranges = [field for field in self._ranges if field not in sort_fields]
+        return set(ranges) <= set(fields[position : position + len(ranges)])
+
+    def _description(self: Self) -> str:
+        parts: list[str] = []
+        if self._equality or self._ranges:
+            parts.append(f"filter on {', '.join([*self._equality, *self._ranges])}")
+        if self._sort:
+            parts.append(f"sort by {', '.join(field if direction > 0 else f'-{field}' for field, direction in self._sort)}")
+        return " with ".join(parts)
+
+    def build(self: Self) -> IndexedQuery:
+        filter_query: dict[str, Any] = {**self._equality, **self._ranges}
+        projection = dict.fromkeys(self._fields, 1) if self._fields is not None else None
+        if projection is not None and "_id" not in projection:
+            projection["_id"] = 0
+
+        if not filter_query and not self._sort:
+            return IndexedQuery(filter=filter_query, sort=[], projection=projection, hint=None)
+
+        sort = self._full_sort()
+        indexes = MongoSetup.declared_indexes(self.model)
+        partial_filters = MongoSetup.declared_partial_filters(self.model)
+        candidates = sorted(
+            (
+                (name, key)
+                for name, key in indexes.items()
+                if all(isinstance(direction, int) for _, direction in key)
+                and self._implies(partial_filters.get(name, {}))
+                and self._supports(key, sort)
+            ),
+            key=lambda item: len(item[1]),
+        )
+        if not candidates:
+            raise BadRequestError(f"No index supports a {self._description()} on {self.model.collection_name}")
+
+        return IndexedQuery(filter=filter_query, sort=sort, projection=projection, hint=candidates[0][0])
@@ -0,0 +1,208 @@
+from collections.abc import Awaitable, Callable
+import json
+from typing import Any, ClassVar, Self
+
+from pydantic import BaseModel
+from pymongo.errors import PyMongoError
+
+from src.configs.config import get_settings
+from src.configs.logging_config import logger
+from src.utils.mongo_driver import MongoCollection
+
+LOGICAL_OPERATORS = ("$and", "$or", "$nor")
+
+
+class QueryPlanReport(BaseModel):
+    namespace: str
+    operation: str
+    shape: dict[str, Any]
+    stages: list[str]
+    index_names: list[str]
+    docs_examined: int
+    keys_examined: int
+    n_returned: int
+    collection_scan: bool
+    partial_index_mismatches: list[str]
+    winning_plan: dict[str, Any]
+
+    @property
+    def index_backed(self: Self) -> bool:
+        return not self.collection_scan and not self.partial_index_mismatches
+
+    def summary(self: Self) -> str:
+        plan = " -> ".join(self.stages) or "UNKNOWN"
+        return (
+            f"{self.namespace} {self.operation} {json.dumps(self.shape)}: {plan}, "
+            f"docsExamined={self.docs_examined}, keysExamined={self.keys_examined}, nReturned={self.n_returned}"
+        )
+
+
+class QueryDiagnostics:
+    _reports: ClassVar[dict[str, QueryPlanReport]] = {}
+    _pending: ClassVar[set[str]] = set()
+    _partial_indexes: ClassVar[dict[str, dict[str, dict[str, Any]]]] = {}
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return get_settings().MONGODB_QUERY_DIAGNOSTICS
+
+    @classmethod
+    def query_shape(cls, value: Any) -> Any:  # noqa: ANN401
+        if isinstance(value, dict):
+            return {key: cls.query_shape(item) for key, item in value.items()}
+        if isinstance(value, list):
+            if any(isinstance(item, dict) for item in value):
+                return [cls.query_shape(item) for item in value]
+            return ["?"]
+        return "?"
+
+    @classmethod
+    def _equality_fields(cls, filter_query: dict[str, Any]) -> set[str]:
+        fields: set[str] = set()
+        for key, value in filter_query.items():
+            if key in LOGICAL_OPERATORS and isinstance(value, list):
+                for branch in value:
+                    fields |= cls._equality_fields(branch)
+            elif not key.startswith("$"):
+                fields.add(key)
+        return fields
+
+    @classmethod
+    def _walk_plan(cls, plan: Any, stages: list[str], index_names: list[str]) -> None:  # noqa: ANN401
+        if isinstance(plan, dict):
+            if "stage" in plan:
+                stages.append(plan["stage"])
+            if "indexName" in plan:
+                index_names.append(plan["indexName"])
+            for value in plan.values():
+                cls._walk_plan(value, stages, index_names)
+        elif isinstance(plan, list):
+            for item in plan:
+                cls._walk_plan(item, stages, index_names)
+
+    @classmethod
+    async def _get_partial_indexes(cls, collection: MongoCollection) -> dict[str, dict[str, Any]]:
+        namespace = f"{collection.database.name}.{collection.name}"
+        if namespace not in cls._partial_indexes:
+            index_information: dict[str, dict[str, Any]] = await collection.index_information()
+            cls._partial_indexes[namespace] = {name: info for name, info in index_information.items() if "partialFilterExpression" in info}
+        return cls._partial_indexes[namespace]
+
+    @classmethod
+    async def explain(
+        cls,
+        collection: MongoCollection,
+        filter_query: dict[str, Any],
+        operation: str = "find",
+    ) -> QueryPlanReport:
+        explained: dict[str, Any] = await collection.database.command(
+            {
+                "explain": {"find": collection.name, "filter": filter_query},
+                "verbosity": "executionStats",
+            },
+        )
+
+        winning_plan: dict[str, Any] = explained.get("queryPlanner", {}).get("winningPlan", {})
+        execution_stats: dict[str, Any] = explained.get("executionStats", {})
+
+        stages: list[str] = []
+        index_names: list[str] = []
+        cls._walk_plan(winning_plan, stages, index_names)
+
+        mismatches: list[str] = []
+        equality_fields = cls._equality_fields(filter_query)
+        for index_name, info in (await cls._get_partial_indexes(collection)).items():
+            field_name: str = info["key"][0][0]
+            if field_name in equality_fields and index_name not in index_names:
+                mismatches.append(
+                    f"{index_name} on {field_name} was not used; the filter must imply {json.dumps(info['partialFilterExpression'])}",
+                )
+
+        return QueryPlanReport(
+            namespace=f"{collection.database.name}.{collection.name}",
+            operation=operation,
+            shape=cls.query_shape(filter_query),
+            stages=stages,
+            index_names=index_names,
+            docs_examined=execution_stats.get("totalDocsExamined", 0),
+            keys_examined=execution_stats.get("totalKeysExamined", 0),
+            n_returned=execution_stats.get("nReturned", 0),
+            collection_scan="COLLSCAN" in stages,
+            partial_index_mismatches=mismatches,
+            winning_plan=winning_plan,
+        )
+
+    @classmethod
+    async def observe(
+        cls,
+        collection: MongoCollection,
+        filter_query: dict[str, Any],
+        operation: str = "find",
+        run: Callable[[Callable[[], Awaitable[QueryPlanReport]]], Awaitable[QueryPlanReport]] | None = None,
+    ) -> None:
+        if not cls.is_enabled():
+            return
+
+        shape = cls.query_shape(filter_query)
+        key = f"{collection.database.name}.{collection.name}:{operation}:{json.dumps(shape, sort_keys=True)}"
+        if key in cls._reports or key in cls._pending:
+            return
+
+        cls._pending.add(key)
+        try:
+            if run is None:
+                report = await cls.explain(collection, filter_query, operation)
+            else:
+                report = await run(lambda: cls.explain(collection, filter_query, operation))
+        except PyMongoError as e:
+            logger.warning(f"Query diagnostics failed for {key}: {e}")
+            return
+        finally:
+            cls._pending.discard(key)
+
+        cls._reports[key] = report
+        cls._append_shape_log(report)
+        if report.collection_scan:
+            logger.warning(f"COLLSCAN detected: {report.summary()}")
+        for mismatch in report.partial_index_mismatches:
+            logger.warning(f"Partial index mismatch: {mismatch} ({report.summary()})")
+
+    @classmethod
+    def _append_shape_log(cls, report: QueryPlanReport) -> None:
+        path = get_settings().MONGODB_QUERY_SHAPE_LOG
+        if not path:
+            return
+
+        try:
+            with open(path, "a") as f:
+                f.write(report.model_dump_json(exclude={"winning_plan"}) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not append to query shape log {path}: {e}")
+
+    @classmethod
+    def reports(cls) -> list[QueryPlanReport]:
+        return list(cls._reports.values())
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._reports.clear()
+        cls._pending.clear()
+        cls._partial_indexes.clear()
+
+    @classmethod
+    def assert_all_index_backed(cls) -> None:
+        offenders = [report for report in cls._reports.values() if not report.index_backed]
+        if offenders:
+            details = "\n".join(report.summary() for report in offenders)
+            raise AssertionError(f"Queries not backed by an index:\n{details}")
+
+
+async def assert_index_backed(
+    collection: MongoCollection,
+    filter_query: dict[str, Any],
+) -> QueryPlanReport:
+    report = await QueryDiagnostics.explain(collection, filter_query)
+    if not report.index_backed:
+        details = "; ".join(report.partial_index_mismatches) or "collection scan"
+        raise AssertionError(f"Query is not index-backed ({details}): {report.summary()}")
+    return report
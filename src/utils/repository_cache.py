@@ -0,0 +1,208 @@
+import asyncio
+from collections import OrderedDict
+import contextlib
+import json
+from typing import Any, ClassVar, Self
+
+import bson
+from pymongo.errors import PyMongoError
+
+from src.configs.logging_config import logger
+from src.utils.mongo_driver import MongoClient, MongoDatabase, resolve
+from src.utils.mongo_model import public_id
+
+MongoDocument = dict[str, Any]
+CacheValue = MongoDocument | None
+
+DOCUMENT_OPERATIONS = ("insert", "update", "replace", "delete")
+NAMESPACE_OPERATIONS = ("drop", "rename", "dropDatabase", "invalidate")
+
+
+class RepositoryCacheConfig:
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+
+class CacheEntry:
+    def __init__(self, value: CacheValue, size: int, document_id: str | None) -> None:
+        self.value = value
+        self.size = size
+        self.document_id = document_id
+
+
+class RepositoryCache:
+    _caches: ClassVar[dict[str, "RepositoryCache"]] = {}
+
+    def __init__(self: Self, namespace: str, config: RepositoryCacheConfig) -> None:
+        self.namespace = namespace
+        self.config = config
+        self.generation = 0
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._keys_by_id: dict[str, set[str]] = {}
+        self._miss_keys: set[str] = set()
+
+    @classmethod
+    def for_namespace(cls, namespace: str, config: RepositoryCacheConfig) -> "RepositoryCache":
+        if namespace not in cls._caches:
+            cls._caches[namespace] = cls(namespace, config)
+        return cls._caches[namespace]
+
+    @classmethod
+    def invalidate_namespace(cls, namespace: str, document_id: str | None = None, operation: str = "update") -> None:
+        cache = cls._caches.get(namespace)
+        if cache is None:
+            return
+        if document_id is None:
+            cache.clear()
+        else:
+            cache.invalidate(document_id, operation)
+
+    @classmethod
+    def clear_all(cls) -> None:
+        for cache in cls._caches.values():
+            cache.clear()
+
+    @staticmethod
+    def make_key(filter_query: dict[str, Any], projection: dict[str, Any] | None = None) -> str:
+        normalized = {
+            "filter": dict(sorted(filter_query.items())),
+            "projection": dict(sorted(projection.items())) if projection else None,
+        }
+        return json.dumps(normalized, default=lambda value: f"{type(value).__name__}:{value}")
+
+    @staticmethod
+    def document_id(filter_query: dict[str, Any]) -> str | None:
+        if len(filter_query) == 1 and isinstance(filter_query.get("_id"), str):
+            return filter_query["_id"]
+        return None
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
+
+    def get(self: Self, key: str) -> tuple[bool, CacheValue]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.value
+
+    def put(self: Self, key: str, value: CacheValue, document_id: str | None, generation: int) -> None:
+        if generation != self.generation:
+            return
+
+        size = len(key) + (len(bson.encode(value)) if value is not None else 0)
+        if size > self.config.max_bytes:
+            return
+
+        # Filter lookups are tracked by the document they returned, so a write only evicts the entries that hold that document.
+        if document_id is None and value is not None:
+            if "_id" not in value:
+                return
+            document_id = str(public_id(value["_id"]))
+
+        self._remove(key)
+        self._entries[key] = CacheEntry(value, size, document_id)
+        self.total_bytes += size
+        if document_id is None:
+            self._miss_keys.add(key)
+        else:
+            self._keys_by_id.setdefault(document_id, set()).add(key)
+
+        while self._entries and (len(self._entries) > self.config.max_entries or self.total_bytes > self.config.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def invalidate(self: Self, document_id: str, operation: str = "update") -> None:
+        self.generation += 1
+        for key in self._keys_by_id.pop(document_id, set()):
+            self._remove(key)
+        # An insert or update can make a cached miss match; a delete cannot.
+        if operation != "delete":
+            for key in list(self._miss_keys):
+                self._remove(key)
+
+    def clear(self: Self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._keys_by_id.clear()
+        self._miss_keys.clear()
+        self.total_bytes = 0
+
+    def _remove(self: Self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        self.total_bytes -= entry.size
+        if entry.document_id is None:
+            self._miss_keys.discard(key)
+        else:
+            keys = self._keys_by_id.get(entry.document_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_id[entry.document_id]
+
+
+class CacheInvalidationListener:
+    def __init__(self: Self, source: MongoDatabase | MongoClient, retry_seconds: float = 1.0) -> None:
+        # A database watches one database; a client watches every tenant database on the cluster.
+        self.source = source
+        self.retry_seconds = retry_seconds
+        self._task: asyncio.Task | None = None
+        self._resume_token: dict[str, Any] | None = None
+
+    async def start(self: Self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Watching {getattr(self.source, 'name', 'all databases')} for cache invalidation")
+
+    async def stop(self: Self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def _apply(self: Self, change: dict[str, Any]) -> None:
+        operation: str = change.get("operationType", "")
+        ns: dict[str, str] = change.get("ns", {})
+        namespace = f"{ns.get('db')}.{ns.get('coll')}"
+
+        if operation in DOCUMENT_OPERATIONS:
+            document_id = change.get("documentKey", {}).get("_id")
+            RepositoryCache.invalidate_namespace(namespace, str(public_id(document_id)), operation)
+        elif operation in NAMESPACE_OPERATIONS:
+            if ns.get("coll"):
+                RepositoryCache.invalidate_namespace(namespace)
+            else:
+                RepositoryCache.clear_all()
+
+    async def _run(self: Self) -> None:
+        pipeline = [{"$match": {"operationType": {"$in": [*DOCUMENT_OPERATIONS, *NAMESPACE_OPERATIONS]}}}]
+        while True:
+            try:
+                change_stream = await resolve(self.source.watch(pipeline, resume_after=self._resume_token))
+                async with change_stream as stream:
+                    async for change in stream:
+                        self._resume_token = stream.resume_token
+                        self._apply(change)
+                RepositoryCache.clear_all()
+                self._resume_token = None
+            except PyMongoError as e:
+                logger.warning(f"Cache invalidation stream interrupted, clearing caches: {e}")
+                RepositoryCache.clear_all()
+                self._resume_token = None
+                await asyncio.sleep(self.retry_seconds)
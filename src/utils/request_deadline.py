@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+import time
+from typing import Any, cast
+
+from fastapi import Depends
+import pymongo
+
+from src.exceptions.gateway_timeout_error import GatewayTimeoutError
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(timeout_seconds: float) -> Token[float | None]:
+    return _deadline.set(time.monotonic() + timeout_seconds)
+
+
+def reset_deadline(token: Token[float | None]) -> None:
+    _deadline.reset(token)
+
+
+def tighten_deadline(timeout_seconds: float) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    current = _deadline.get()
+    if current is None or deadline < current:
+        _deadline.set(deadline)
+
+
+def remaining_seconds() -> float | None:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def is_expired() -> bool:
+    remaining = remaining_seconds()
+    return remaining is not None and remaining <= 0
+
+
+@contextmanager
+def mongo_timeout() -> Iterator[None]:
+    remaining = remaining_seconds()
+    if remaining is None:
+        yield
+        return
+
+    if remaining <= 0:
+        raise GatewayTimeoutError()
+
+    with pymongo.timeout(remaining):
+        yield
+
+
+def request_timeout(milliseconds: int) -> Any:  # noqa: ANN401
+    async def apply_request_timeout() -> None:
+        tighten_deadline(milliseconds / 1000)
+
+    return cast(Any, Depends(apply_request_timeout))
@@ -0,0 +1,137 @@
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+from typing import Any, Self, TypeVar, cast
+
+from pymongo import monitoring
+
+from src.configs.config import get_settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_counter: ContextVar["RoundTripCounter | None"] = ContextVar("mongo_round_trips", default=None)
+
+
+class RoundTripCounter:
+    def __init__(self: Self) -> None:
+        self.commands: Counter[tuple[str, str]] = Counter()
+
+    @property
+    def total(self: Self) -> int:
+        return sum(self.commands.values())
+
+    def by_collection(self: Self) -> dict[str, int]:
+        collections: Counter[str] = Counter()
+        for (collection, _), count in self.commands.items():
+            collections[collection] += count
+        return dict(collections)
+
+    def record(self: Self, collection: str, command: str) -> None:
+        self.commands[(collection, command)] += 1
+
+    def merge(self: Self, other: "RoundTripCounter") -> None:
+        self.commands.update(other.commands)
+
+    def summary(self: Self) -> str:
+        details = [
+            f"{collection}.{command}={count}" if collection else f"{command}={count}"
+            for (collection, command), count in sorted(self.commands.items())
+        ]
+        return "; ".join([str(self.total), *details])
+
+
+class RoundTripListener(monitoring.CommandListener):
+    def started(self: Self, event: monitoring.CommandStartedEvent) -> None:
+        counter = _counter.get()
+        if counter is None:
+            return
+
+        # getMore names the cursor id in the command field and the collection separately.
+        target = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+        counter.record(target if isinstance(target, str) else "", event.command_name)
+
+    def succeeded(self: Self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self: Self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+def is_enabled() -> bool:
+    return get_settings().MONGODB_ROUND_TRIP_TRACKING
+
+
+def current_round_trips() -> RoundTripCounter | None:
+    return _counter.get()
+
+
+@contextmanager
+def track_round_trips() -> Iterator[RoundTripCounter]:
+    parent = _counter.get()
+    counter = RoundTripCounter()
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
+        if parent is not None:
+            parent.merge(counter)
+
+
+class RoundTripBudget:
+    def __init__(self: Self, max_total: int | None = None, per_collection: dict[str, int] | None = None) -> None:
+        self.max_total = max_total
+        self.per_collection = per_collection or {}
+        self._trackers: list[tuple[AbstractContextManager[RoundTripCounter], RoundTripCounter]] = []
+
+    def check(self: Self, counter: RoundTripCounter) -> None:
+        violations: list[str] = []
+        if self.max_total is not None and counter.total > self.max_total:
+            violations.append(f"{counter.total} commands > {self.max_total}")
+
+        by_collection = counter.by_collection()
+        for collection, limit in self.per_collection.items():
+            if by_collection.get(collection, 0) > limit:
+                violations.append(f"{by_collection[collection]} commands on {collection} > {limit}")
+
+        if violations:
+            raise AssertionError(f"Round-trip budget exceeded ({', '.join(violations)}): {counter.summary()}")
+
+    def __enter__(self: Self) -> RoundTripCounter:
+        if not is_enabled():
+            raise AssertionError("Round-trip tracking is disabled; set MONGODB_ROUND_TRIP_TRACKING=true")
+
+        tracker = track_round_trips()
+        counter = tracker.__enter__()
+        self._trackers.append((tracker, counter))
+        return counter
+
+    def __exit__(self: Self, exc_type: type[BaseException] | None, *args: object) -> None:
+        tracker, counter = self._trackers.pop()
+        tracker.__exit__(exc_type, *args)
+        if exc_type is None:
+            self.check(counter)
+
+    def __call__(self: Self, func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                with self:
+                    return await cast(Callable[..., Awaitable[Any]], func)(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            with self:
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+
+def round_trip_budget(max_total: int | None = None, **per_collection: int) -> RoundTripBudget:
+    return RoundTripBudget(max_total, per_collection)
@@ -0,0 +1,47 @@
+from contextvars import ContextVar, Token
+import re
+
+from src.configs.config import get_settings
+from src.exceptions.badrequest_error import BadRequestError
+
+# Database names may not contain "." or "/" and are limited to 64 bytes, prefix included.
+TENANT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,47}$")
+
+_tenant: ContextVar[str | None] = ContextVar("tenant_id", default=None)
+
+
+def configured_tenants() -> list[str]:
+    return [value.strip() for value in get_settings().TENANT_IDS.split(",") if value.strip()]
+
+
+def validate_tenant(tenant_id: str) -> str:
+    if not TENANT_ID_PATTERN.match(tenant_id):
+        raise BadRequestError(f"Invalid tenant id: {tenant_id}")
+
+    # Only listed tenants get a database; anything else could be sent by an unauthenticated caller.
+    if tenant_id not in configured_tenants():
+        raise BadRequestError(f"Unknown tenant: {tenant_id}")
+    return tenant_id
+
+
+def set_tenant(tenant_id: str | None) -> Token[str | None]:
+    return _tenant.set(tenant_id)
+
+
+def reset_tenant(token: Token[str | None]) -> None:
+    _tenant.reset(token)
+
+
+def current_tenant() -> str | None:
+    return _tenant.get()
+
+
+def tenant_database_name(tenant_id: str | None) -> str:
+    settings = get_settings()
+    if tenant_id is None:
+        return settings.DATABASE_NAME
+    return f"{settings.TENANT_DATABASE_PREFIX}{tenant_id}"
+
+
+def current_database_name() -> str:
+    return tenant_database_name(_tenant.get())
@@ -1,12 +1,93 @@
-from email_validator import EmailNotValidError, validate_email
+import asyncio
+from typing import TYPE_CHECKING, Self
 
+from email_validator import EmailNotValidError, EmailUndeliverableError, validate_email
+
+from src.configs.config import get_settings
+from src.configs.logging_config import logger
 from src.exceptions.badrequest_error import BadRequestError
+from src.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    import dns.resolver
 
 
 def validate_email_format(email: str | None) -> str | None:
     if not email:
         return None
     try:
-        return validate_email(email).email
+        return validate_email(email, check_deliverability=False).normalized
     except EmailNotValidError as e:
         raise BadRequestError(f"Invalid email format: {e!s}") from e
+
+
+class EmailDeliverabilityChecker:
+    def __init__(
+        self: Self,
+        enabled: bool = False,
+        timeout_seconds: float = 2.0,
+        cache_size: int = 10_000,
+        ttl_seconds: float = 3600,
+        negative_ttl_seconds: float = 300,
+    ) -> None:
+        self.enabled = enabled
+        self.timeout_seconds = timeout_seconds
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._cache: TTLCache[str, str | None] = TTLCache(cache_size)
+        self._pending: dict[str, asyncio.Future[str | None]] = {}
+        self._resolver: dns.resolver.Resolver | None = None
+
+    @classmethod
+    def from_settings(cls) -> "EmailDeliverabilityChecker":
+        settings = get_settings()
+        return cls(
+            enabled=settings.EMAIL_DELIVERABILITY_CHECK,
+            timeout_seconds=settings.EMAIL_DNS_TIMEOUT_SECONDS,
+            cache_size=settings.EMAIL_DOMAIN_CACHE_SIZE,
+            ttl_seconds=settings.EMAIL_DOMAIN_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=settings.EMAIL_DOMAIN_NEGATIVE_TTL_SECONDS,
+        )
+
+    def _lookup(self: Self, domain: str) -> tuple[str | None, bool]:
+        # dnspython is only loaded once a deliverability check actually runs.
+        import dns.resolver
+        from email_validator.deliverability import validate_email_deliverability
+
+        if self._resolver is None:
+            self._resolver = dns.resolver.Resolver()
+            self._resolver.lifetime = self.timeout_seconds
+
+        try:
+            info = validate_email_deliverability(domain, domain, dns_resolver=self._resolver)
+        except EmailUndeliverableError as e:
+            return str(e), True
+        return None, "unknown-deliverability" not in info
+
+    async def _resolve_domain(self: Self, domain: str) -> str | None:
+        try:
+            error, is_conclusive = await asyncio.wait_for(asyncio.to_thread(self._lookup, domain), self.timeout_seconds)
+        except TimeoutError:
+            logger.warning(f"Email deliverability lookup for {domain} timed out, accepting")
+            return None
+
+        if is_conclusive:
+            self._cache.set(domain, error, self.negative_ttl_seconds if error else self.ttl_seconds)
+        return error
+
+    async def check(self: Self, email: str | None) -> None:
+        if not self.enabled or not email:
+            return
+
+        domain = email.rsplit("@", 1)[-1].lower()
+        hit, error = self._cache.get(domain)
+        if not hit:
+            pending = self._pending.get(domain)
+            if pending is None:
+                pending = asyncio.ensure_future(self._resolve_domain(domain))
+                self._pending[domain] = pending
+                pending.add_done_callback(lambda _: self._pending.pop(domain, None))
+            error = await asyncio.shield(pending)
+
+        if error:
+            raise BadRequestError(f"Email address is not deliverable: {error}")
@@ -0,0 +1,203 @@
+import asyncio
+import contextlib
+import time
+from typing import Literal, Self
+
+from pydantic import BaseModel
+from pymongo import DeleteOne, InsertOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from src.configs.config import get_settings
+from src.configs.database_config import MongoDB
+from src.configs.logging_config import logger
+from src.utils.repository_cache import RepositoryCache
+from src.utils.tenant_context import current_database_name
+
+WriteOperation = InsertOne | UpdateOne | UpdateMany | DeleteOne
+OverflowPolicy = Literal["drop", "block"]
+
+
+class PendingWrite:
+    def __init__(self, database_name: str, collection_name: str, operation: WriteOperation, document_id: str | None) -> None:
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.operation = operation
+        self.document_id = document_id
+
+
+class WriteBehindMetrics(BaseModel):
+    queue_depth: int
+    queue_capacity: int
+    enqueued: int
+    dropped: int
+    written: int
+    failed: int
+    flushes: int
+    last_flush_ms: float
+    max_flush_ms: float
+    avg_flush_ms: float
+
+
+class WriteBehindBuffer:
+    def __init__(
+        self: Self,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        overflow_policy: OverflowPolicy = "drop",
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self._queue: asyncio.Queue[PendingWrite] = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task | None = None
+        self._collecting: list[PendingWrite] = []
+        self._inflight: asyncio.Future | None = None
+
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+        self._failed = 0
+        self._flushes = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "WriteBehindBuffer":
+        settings = get_settings()
+        return cls(
+            max_queue_size=settings.WRITE_BEHIND_QUEUE_SIZE,
+            batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval_seconds=settings.WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+            overflow_policy=settings.WRITE_BEHIND_OVERFLOW_POLICY,
+        )
+
+    @property
+    def metrics(self: Self) -> WriteBehindMetrics:
+        return WriteBehindMetrics(
+            queue_depth=self._queue.qsize(),
+            queue_capacity=self._queue.maxsize,
+            enqueued=self._enqueued,
+            dropped=self._dropped,
+            written=self._written,
+            failed=self._failed,
+            flushes=self._flushes,
+            last_flush_ms=self._last_flush_ms,
+            max_flush_ms=self._max_flush_ms,
+            avg_flush_ms=self._total_flush_ms / self._flushes if self._flushes else 0.0,
+        )
+
+    async def enqueue(
+        self: Self,
+        collection_name: str,
+        operation: WriteOperation,
+        document_id: str | None = None,
+        database_name: str | None = None,
+    ) -> bool:
+        # The flush runs outside the request, so the tenant database is captured now.
+        pending = PendingWrite(database_name or current_database_name(), collection_name, operation, document_id)
+
+        if self.overflow_policy == "block":
+            await self._queue.put(pending)
+        else:
+            try:
+                self._queue.put_nowait(pending)
+            except asyncio.QueueFull:
+                self._dropped += 1
+                return False
+
+        self._enqueued += 1
+        return True
+
+    async def start(self: Self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self: Self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+
+        remaining, self._collecting = self._collecting, []
+        remaining.extend(self._drain(self._queue.qsize()))
+        for start in range(0, len(remaining), self.batch_size):
+            await self._flush(remaining[start : start + self.batch_size])
+
+        metrics = self.metrics
+        logger.info(f"Write-behind buffer stopped: written={metrics.written}, dropped={metrics.dropped}, failed={metrics.failed}")
+
+    def _drain(self: Self, limit: int) -> list[PendingWrite]:
+        batch: list[PendingWrite] = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self: Self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._collecting = batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval_seconds
+
+            while len(batch) < self.batch_size:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                remaining = deadline - loop.time()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                # asyncio.timeout rather than wait_for: on 3.11 wait_for can swallow the cancel from stop()
+                # when the get completes at the same moment, leaving stop() waiting forever.
+                try:
+                    async with asyncio.timeout(remaining):
+                        batch.append(await self._queue.get())
+                except TimeoutError:
+                    break
+
+            self._collecting = []
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _flush(self: Self, batch: list[PendingWrite]) -> None:
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        grouped: dict[tuple[str, str], list[PendingWrite]] = {}
+        for pending in batch:
+            grouped.setdefault((pending.database_name, pending.collection_name), []).append(pending)
+
+        for (database_name, collection_name), pending_writes in grouped.items():
+            try:
+                collection = MongoDB.get_collection(collection_name, database_name=database_name)
+                await collection.bulk_write([pending.operation for pending in pending_writes], ordered=False)
+            except BulkWriteError as e:
+                failed = len(e.details.get("writeErrors", []))
+                self._failed += failed
+                self._written += len(pending_writes) - failed
+                logger.error(f"Write-behind flush to {database_name}.{collection_name} had {failed} failed operations")
+            except PyMongoError as e:
+                self._failed += len(pending_writes)
+                logger.error(f"Write-behind flush to {database_name}.{collection_name} failed for {len(pending_writes)} operations: {e}")
+            except Exception as e:
+                # Anything else would end the flush task and strand the queue, so count it and carry on.
+                self._failed += len(pending_writes)
+                logger.exception(f"Write-behind flush to {database_name}.{collection_name} crashed for {len(pending_writes)} operations: {e}")
+            else:
+                self._written += len(pending_writes)
+
+            namespace = f"{database_name}.{collection_name}"
+            for pending in pending_writes:
+                if pending.document_id is not None:
+                    RepositoryCache.invalidate_namespace(namespace, pending.document_id)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._flushes += 1
+        self._last_flush_ms = elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
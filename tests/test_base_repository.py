@@ -0,0 +1,141 @@
+from datetime import UTC, datetime
+from typing import Any, ClassVar
+
+from pymongo import monitoring
+import pytest
+
+from src.configs.config import get_settings
+from src.configs.database_config import MongoDB
+from src.exceptions.conflict_error import ConflictError
+from src.utils.base_repository import BaseRepository
+from src.utils.mongo_model import MongoBaseModel
+from src.utils.round_trips import RoundTripListener, round_trip_budget
+
+pytestmark = pytest.mark.anyio
+
+listener = RoundTripListener()
+
+
+class Widget(MongoBaseModel):
+    name: str
+    color: str = "red"
+    version: int = 0
+
+    collection_name: ClassVar[str] = "widgets"
+    version_field: ClassVar[str | None] = "version"
+    tenant_scoped: ClassVar[bool] = False
+
+
+class FakeCollection:
+    name = "widgets"
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.calls: list[tuple[str, tuple[Any, ...]]] = []
+
+    def _send(self, command: dict[str, Any], *args: dict[str, Any]) -> None:
+        self.calls.append((next(iter(command)), args))
+        listener.started(monitoring.CommandStartedEvent(command, "test", 1, ("localhost", 27017), 1))
+
+    def _match(self, filter_query: dict[str, Any]) -> dict[str, Any] | None:
+        doc = self.docs.get(filter_query["_id"])
+        if doc is None or any(doc.get(key) != value for key, value in filter_query.items()):
+            return None
+        return doc
+
+    async def find_one_and_update(self, filter_query: dict[str, Any], update: dict[str, Any], return_document: bool) -> dict[str, Any] | None:  # noqa: ARG002
+        self._send({"findAndModify": self.name}, filter_query, update)
+        doc = self._match(filter_query)
+        if doc is None:
+            return None
+        doc.update(update["$set"])
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        return dict(doc)
+
+    async def count_documents(self, filter_query: dict[str, Any], limit: int = 0) -> int:  # noqa: ARG002
+        self._send({"count": self.name}, filter_query)
+        return int(self._match(filter_query) is not None)
+
+
+@pytest.fixture
+def collection(monkeypatch) -> FakeCollection:
+    collection = FakeCollection()
+    collection.docs["w1"] = {
+        "_id": "w1",
+        "name": "gear",
+        "color": "red",
+        "version": 3,
+        "created_at": datetime(2024, 1, 1, tzinfo=UTC),
+        "updated_at": datetime(2024, 1, 1, tzinfo=UTC),
+    }
+    monkeypatch.setattr(MongoDB, "get_collection", lambda *_, **__: collection)
+    monkeypatch.setattr(MongoDB, "is_ready", lambda _: True)
+    return collection
+
+
+@pytest.fixture
+def repository() -> BaseRepository[Widget]:
+    return BaseRepository(Widget)
+
+
+async def test_update_sets_only_dirty_fields(collection, repository):
+    widget = repository._to_entity(collection.docs["w1"])
+    widget.color = "blue"
+
+    updated = await repository.update("w1", widget)
+
+    [(_, (filter_query, update))] = collection.calls
+    assert filter_query == {"_id": "w1", "version": 3}
+    assert set(update["$set"]) == {"color", "updated_at"}
+    assert update["$inc"] == {"version": 1}
+    assert updated is not None
+    assert updated.color == "blue"
+    assert updated.version == 4
+    assert updated.dirty_fields == set()
+
+
+async def test_update_never_sets_id_or_created_at(collection, repository):
+    widget = repository._to_entity(collection.docs["w1"])
+    widget.id = "w2"
+    widget.created_at = datetime.now(UTC)
+
+    assert await repository.update("w1", widget) is widget
+    assert collection.calls == []
+
+    widget.name = "cog"
+    await repository.update("w1", widget)
+
+    [(_, (_, update))] = collection.calls
+    assert set(update["$set"]) == {"name", "updated_at"}
+
+
+async def test_update_is_one_round_trip(monkeypatch, collection, repository):
+    monkeypatch.setattr(get_settings(), "MONGODB_ROUND_TRIP_TRACKING", True)
+    widget = repository._to_entity(collection.docs["w1"])
+    widget.name = "cog"
+
+    with round_trip_budget(max_total=1) as counter:
+        await repository.update("w1", widget)
+
+    assert counter.summary() == "1; widgets.findAndModify=1"
+
+
+async def test_stale_version_raises_conflict(collection, repository):
+    widget = repository._to_entity(collection.docs["w1"])
+    collection.docs["w1"]["version"] = 4
+    widget.name = "cog"
+
+    with pytest.raises(ConflictError, match="modified concurrently"):
+        await repository.update("w1", widget)
+
+    assert [name for name, _ in collection.calls] == ["findAndModify", "count"]
+    assert collection.docs["w1"]["name"] == "gear"
+
+
+async def test_missing_document_is_not_a_conflict(collection, repository):
+    widget = repository._to_entity(collection.docs.pop("w1"))
+    widget.name = "cog"
+
+    assert await repository.update("w1", widget) is None
+    assert [name for name, _ in collection.calls] == ["findAndModify", "count"]
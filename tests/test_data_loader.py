@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, ClassVar
+
+import pytest
+
+from src.configs.database_config import MongoDB
+from src.utils.base_repository import BaseRepository
+from src.utils.data_loader import DataLoader, EntityLoader
+from src.utils.mongo_model import MongoBaseModel
+
+pytestmark = pytest.mark.anyio
+
+
+class Widget(MongoBaseModel):
+    name: str
+
+    collection_name: ClassVar[str] = "widgets"
+    tenant_scoped: ClassVar[bool] = False
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    async def to_list(self, length: int | None) -> list[dict[str, Any]]:  # noqa: ARG002
+        return self.docs
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.filters: list[dict[str, Any]] = []
+
+    def find(self, filter_query: dict[str, Any]) -> FakeCursor:
+        self.filters.append(filter_query)
+        return FakeCursor([self.docs[id] for id in filter_query["_id"]["$in"] if id in self.docs])
+
+
+@pytest.fixture
+def collection(monkeypatch) -> FakeCollection:
+    collection = FakeCollection([{"_id": "w1", "name": "gear"}, {"_id": "w2", "name": "cog"}])
+    monkeypatch.setattr(MongoDB, "get_collection", lambda *_, **__: collection)
+    monkeypatch.setattr(MongoDB, "is_ready", lambda _: True)
+    return collection
+
+
+async def test_concurrent_loads_share_one_in_query(collection):
+    loader = EntityLoader(BaseRepository(Widget))
+
+    widgets = await asyncio.gather(loader.load("w1"), loader.load("w2"), loader.load("w1"), loader.load("missing"))
+
+    assert collection.filters == [{"_id": {"$in": ["w1", "w2", "missing"]}}]
+    assert [widget.name if widget else None for widget in widgets] == ["gear", "cog", "gear", None]
+
+
+async def test_loaded_keys_are_memoised(collection):
+    loader = EntityLoader(BaseRepository(Widget))
+
+    await loader.load("w1")
+    assert await loader.load_many(["w1", "w2"]) == [await loader.load("w1"), await loader.load("w2")]
+
+    assert collection.filters == [{"_id": {"$in": ["w1"]}}, {"_id": {"$in": ["w2"]}}]
+
+
+async def test_batch_failure_is_raised_to_every_caller():
+    async def fail(keys: list[str]) -> dict[str, str]:
+        raise ValueError(f"cannot load {keys}")
+
+    loader: DataLoader[str, str] = DataLoader(fail)
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+    assert [str(result) for result in results] == ["cannot load ['a', 'b']"] * 2
@@ -0,0 +1,48 @@
+import sys
+
+import pytest
+
+from src.cli import import_profile
+from src.cli.import_profile import ImportRecord, parse_importtime, profile_once
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:       300 |        900 |   src.configs.config
+import time:       600 |       1500 | src.main
+"""
+
+
+def run_main(monkeypatch, records: list[ImportRecord], connected: bool, *args: str) -> int:
+    monkeypatch.setattr(import_profile, "profile_once", lambda _: (records, connected))
+    monkeypatch.setattr(sys, "argv", ["import_profile", "--repeat", "1", *args])
+    with pytest.raises(SystemExit) as exit_info:
+        import_profile.main()
+    return exit_info.value.code
+
+
+def test_parse_importtime():
+    records = parse_importtime(IMPORTTIME)
+
+    assert [(record.name, record.self_us, record.cumulative_us, record.depth) for record in records] == [
+        ("_io", 120, 120, 0),
+        ("src.configs.config", 300, 900, 1),
+        ("src.main", 600, 1500, 0),
+    ]
+
+
+def test_budget_exceeded_fails(monkeypatch):
+    records = parse_importtime(IMPORTTIME)
+
+    assert run_main(monkeypatch, records, False, "--budget-ms", "0.5") == 1
+    assert run_main(monkeypatch, records, False, "--budget-ms", "5") == 0
+
+
+def test_client_created_on_import_fails(monkeypatch):
+    assert run_main(monkeypatch, parse_importtime(IMPORTTIME), True) == 1
+
+
+def test_importing_app_does_not_connect():
+    records, connected = profile_once("src.main")
+
+    assert not connected
+    assert any(record.name == "src.main" for record in records)
@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, ClassVar
+
+from pymongo.errors import AutoReconnect, OperationFailure
+import pytest
+
+from src.configs.database_config import MongoDB
+from src.exceptions.service_unavailable_error import ServiceUnavailableError
+from src.utils import base_repository
+from src.utils.base_repository import BaseRepository
+from src.utils.mongo_health import CircuitBreaker, CircuitState
+from src.utils.mongo_model import MongoBaseModel
+
+pytestmark = pytest.mark.anyio
+
+
+async def ok() -> str:
+    return "ok"
+
+
+async def connection_lost() -> None:
+    raise AutoReconnect("connection lost")
+
+
+async def query_failed() -> None:
+    raise OperationFailure("bad query")
+
+
+async def test_opens_after_consecutive_connection_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=60)
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailableError):
+            await breaker.call(connection_lost)
+    assert breaker.state is CircuitState.CLOSED
+
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(connection_lost)
+    assert breaker.state is CircuitState.OPEN
+
+    calls: list[str] = []
+
+    async def tracked() -> None:
+        calls.append("called")
+
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(tracked)
+    assert calls == []
+
+
+async def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(connection_lost)
+    assert await breaker.call(ok) == "ok"
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(connection_lost)
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.consecutive_failures == 1
+
+
+async def test_other_driver_errors_are_not_failures():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+
+    with pytest.raises(OperationFailure):
+        await breaker.call(query_failed)
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+async def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(connection_lost)
+
+    release = asyncio.Event()
+
+    async def slow_probe() -> str:
+        await release.wait()
+        return "probe"
+
+    probe = asyncio.create_task(breaker.call(slow_probe))
+    await asyncio.sleep(0)
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(ok)
+
+    release.set()
+    assert await probe == "probe"
+    assert breaker.state is CircuitState.CLOSED
+    assert await breaker.call(ok) == "ok"
+
+
+async def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=0)
+    breaker.trip()
+
+    with pytest.raises(ServiceUnavailableError):
+        await breaker.call(connection_lost)
+
+    assert breaker.state is CircuitState.OPEN
+
+
+class Widget(MongoBaseModel):
+    collection_name: ClassVar[str] = "widgets"
+    tenant_scoped: ClassVar[bool] = False
+
+
+class UnreachableCollection:
+    async def find_one(self, *_: dict[str, Any] | None) -> None:
+        raise AutoReconnect("connection refused")
+
+
+async def test_repository_maps_connection_failure_to_503(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+    monkeypatch.setattr(base_repository, "circuit_breaker", breaker)
+    monkeypatch.setattr(MongoDB, "get_collection", lambda *_, **__: UnreachableCollection())
+    monkeypatch.setattr(MongoDB, "is_ready", lambda _: True)
+    repository = BaseRepository(Widget)
+
+    for _ in range(3):
+        with pytest.raises(ServiceUnavailableError) as error:
+            await repository.find_by_id("w1")
+        assert error.value.status_code == 503
+
+    assert breaker.state is CircuitState.OPEN
@@ -0,0 +1,32 @@
+from src.entities.revoked_token_entity import RevokedTokenEntity
+from src.entities.user_entity import UserEntity
+from src.utils.mongo_setup import MongoSetup
+from src.utils.query_builder import QueryBuilder
+
+
+def test_created_at_index_is_skipped_when_a_compound_index_starts_with_it():
+    assert MongoSetup.base_index_fields(UserEntity) == []
+    assert "created_at_1" not in MongoSetup.declared_indexes(UserEntity)
+    assert MongoSetup.declared_indexes(UserEntity)["created_at_1__id_1"] == [("created_at", 1), ("_id", 1)]
+
+
+def test_created_at_index_is_kept_otherwise():
+    assert MongoSetup.base_index_fields(RevokedTokenEntity) == ["created_at"]
+    assert MongoSetup.declared_indexes(RevokedTokenEntity)["created_at_1"] == [("created_at", 1)]
+
+
+def test_user_indexes_have_no_redundant_prefixes():
+    # Unique indexes enforce a constraint, so they are needed even when another index starts with the same fields.
+    unique = MongoSetup.get_unique_indexes(UserEntity)
+    keys = [[field for field, _ in key] for name, key in MongoSetup.declared_indexes(UserEntity).items() if name not in unique]
+    all_keys = [[field for field, _ in key] for key in MongoSetup.declared_indexes(UserEntity).values()]
+
+    redundant = [key for key in keys if any(other != key and other[: len(key)] == key for other in all_keys)]
+
+    assert redundant == []
+
+
+def test_user_listing_uses_compound_indexes():
+    assert QueryBuilder(UserEntity).where("role", "ADMIN").build().hint == "role_1_email_1"
+    assert QueryBuilder(UserEntity).between("created_at", lower="2024-01-01").build().hint == "created_at_1__id_1"
+    assert QueryBuilder(UserEntity).order_by("created_at", -1).build().hint == "created_at_1__id_1"
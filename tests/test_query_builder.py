@@ -0,0 +1,86 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from src.exceptions.badrequest_error import BadRequestError
+from src.utils.mongo_field import MongoField
+from src.utils.mongo_model import MongoBaseModel, collection_name
+from src.utils.query_builder import QueryBuilder
+
+
+@collection_name("articles")
+class Article(MongoBaseModel):
+    slug: str | None = MongoField[str](default=None, unique=True, partial=True)()
+    status: str = MongoField[str](default="draft")()
+    title: str = MongoField[str](default="", index=True)()
+
+
+Article.add_compound_index(fields=["status", "title", "_id"])
+Article.add_compound_index(fields=["status", "created_at", "_id"])
+Article.add_compound_index(fields=["slug", "created_at", "_id"], partial=True)
+
+JANUARY = datetime(2024, 1, 1, tzinfo=UTC)
+FEBRUARY = datetime(2024, 2, 1, tzinfo=UTC)
+
+
+def test_equality_then_sort():
+    query = QueryBuilder(Article).where("status", "published").order_by("created_at", -1).build()
+
+    assert query.hint == "status_1_created_at_1__id_1"
+    assert query.filter == {"status": "published"}
+    assert query.sort == [("created_at", -1), ("_id", -1)]
+
+
+def test_equality_then_range():
+    query = QueryBuilder(Article).where("status", "published").between("created_at", JANUARY, FEBRUARY).build()
+
+    assert query.hint == "status_1_created_at_1__id_1"
+    assert query.filter == {"status": "published", "created_at": {"$gte": JANUARY, "$lt": FEBRUARY}}
+
+
+def test_range_before_sort_is_rejected():
+    builder = QueryBuilder(Article).where("status", "published").between("created_at", JANUARY).order_by("title")
+
+    with pytest.raises(BadRequestError, match="filter on status, created_at with sort by title on articles") as error:
+        builder.build()
+
+    assert error.value.status_code == 400
+
+
+def test_sort_ends_with_id():
+    query = QueryBuilder(Article).where("status", "published").order_by("title").build()
+
+    assert query.sort == [("title", 1), ("_id", 1)]
+    assert query.hint == "status_1_title_1__id_1"
+
+
+def test_index_without_id_tiebreak_cannot_sort():
+    # title_1 matches the requested sort, but not the _id tiebreak that keeps pages stable.
+    with pytest.raises(BadRequestError, match="sort by title"):
+        QueryBuilder(Article).order_by("title").build()
+
+
+def test_explicit_id_sort_is_not_extended():
+    query = QueryBuilder(Article).where("status", "published").order_by("title").order_by("_id", 1).build()
+
+    assert query.sort == [("title", 1), ("_id", 1)]
+
+
+def test_partial_index_needs_equality_on_its_field():
+    query = QueryBuilder(Article).where("slug", "hello").order_by("created_at").build()
+
+    assert query.hint == "slug_1_created_at_1__id_1"
+    with pytest.raises(BadRequestError, match="filter on slug"):
+        QueryBuilder(Article).between("slug", "a", "m").build()
+
+
+def test_shortest_supporting_index_wins():
+    assert QueryBuilder(Article).where("slug", "hello").build().hint == "slug_1"
+
+
+def test_no_filter_or_sort_needs_no_index():
+    query = QueryBuilder(Article).select(["title"]).build()
+
+    assert query.hint is None
+    assert query.filter == {}
+    assert query.projection == {"title": 1, "_id": 0}
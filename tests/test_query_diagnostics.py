@@ -0,0 +1,91 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from src.utils.query_diagnostics import QueryDiagnostics, QueryPlanReport, assert_index_backed
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeDatabase:
+    def __init__(self, explained: dict[str, Any]) -> None:
+        self.name = "test"
+        self.explained = explained
+        self.commands: list[dict[str, Any]] = []
+
+    async def command(self, command: dict[str, Any]) -> dict[str, Any]:
+        self.commands.append(command)
+        return self.explained
+
+
+class FakeCollection:
+    def __init__(self, winning_plan: dict[str, Any], indexes: dict[str, dict[str, Any]] | None = None) -> None:
+        self.name = "users"
+        self.database = FakeDatabase(
+            {
+                "queryPlanner": {"winningPlan": winning_plan},
+                "executionStats": {"totalDocsExamined": 1, "totalKeysExamined": 1, "nReturned": 1},
+            },
+        )
+        self.indexes = indexes or {}
+
+    async def index_information(self) -> dict[str, dict[str, Any]]:
+        return {"_id_": {"key": [("_id", 1)]}, **self.indexes}
+
+
+USERNAME_INDEX = {
+    "username_1": {
+        "key": [("username", 1)],
+        "unique": True,
+        "partialFilterExpression": {"username": {"$exists": True, "$type": "string"}},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_diagnostics():
+    QueryDiagnostics.reset()
+    yield
+    QueryDiagnostics.reset()
+
+
+async def test_index_scan_passes():
+    collection = FakeCollection({"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "username_1"}}, USERNAME_INDEX)
+
+    report = await assert_index_backed(collection, {"username": "bob"})
+
+    assert report.stages == ["FETCH", "IXSCAN"]
+    assert report.index_names == ["username_1"]
+    assert report.shape == {"username": "?"}
+    assert collection.database.commands[0]["explain"] == {"find": "users", "filter": {"username": "bob"}}
+
+
+async def test_collection_scan_fails():
+    collection = FakeCollection({"stage": "COLLSCAN"})
+
+    with pytest.raises(AssertionError, match="collection scan"):
+        await assert_index_backed(collection, {"name": "bob"})
+
+
+async def test_unused_partial_index_fails():
+    collection = FakeCollection({"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "role_1"}}, USERNAME_INDEX)
+
+    with pytest.raises(AssertionError, match="username_1 on username was not used"):
+        await assert_index_backed(collection, {"$or": [{"username": "bob"}, {"role": "ADMIN"}]})
+
+
+async def test_observe_runs_explain_through_runner(monkeypatch):
+    monkeypatch.setattr(QueryDiagnostics, "is_enabled", classmethod(lambda _: True))
+    collection = FakeCollection({"stage": "COLLSCAN"})
+    runs: list[str] = []
+
+    async def run(operation: Callable[[], Awaitable[QueryPlanReport]]) -> QueryPlanReport:
+        runs.append("explain")
+        return await operation()
+
+    await QueryDiagnostics.observe(collection, {"name": "bob"}, "find", run)
+    await QueryDiagnostics.observe(collection, {"name": "alice"}, "find", run)
+
+    assert runs == ["explain"]
+    assert [report.collection_scan for report in QueryDiagnostics.reports()] == [True]
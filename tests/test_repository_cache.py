@@ -0,0 +1,95 @@
+import uuid
+
+from bson import Binary
+
+from src.entities.user_entity import UserEntity
+from src.utils.repository_cache import RepositoryCache, RepositoryCacheConfig
+
+
+def make_cache(max_entries: int = 100, max_bytes: int = 1024 * 1024) -> RepositoryCache:
+    return RepositoryCache("test.users", RepositoryCacheConfig(max_entries=max_entries, max_bytes=max_bytes))
+
+
+def by_username(username: str) -> str:
+    return RepositoryCache.make_key({"username": username})
+
+
+def test_put_is_skipped_after_invalidation():
+    cache = make_cache()
+    generation = cache.generation
+    cache.invalidate("1")
+
+    cache.put(by_username("alice"), {"_id": "1", "username": "alice"}, None, generation)
+
+    assert cache.get(by_username("alice")) == (False, None)
+
+
+def test_write_evicts_only_entries_of_that_document():
+    cache = make_cache()
+    cache.put(by_username("alice"), {"_id": "1", "username": "alice"}, None, cache.generation)
+    cache.put(RepositoryCache.make_key({"_id": "1"}), {"_id": "1", "username": "alice"}, "1", cache.generation)
+    cache.put(by_username("bob"), {"_id": "2", "username": "bob"}, None, cache.generation)
+
+    cache.invalidate("1")
+
+    assert cache.get(by_username("alice"))[0] is False
+    assert cache.get(RepositoryCache.make_key({"_id": "1"}))[0] is False
+    assert cache.get(by_username("bob")) == (True, {"_id": "2", "username": "bob"})
+
+
+def test_misses_are_evicted_on_insert_and_update_but_not_delete():
+    cache = make_cache()
+    cache.put(by_username("carol"), None, None, cache.generation)
+
+    cache.invalidate("9", "delete")
+    assert cache.get(by_username("carol")) == (True, None)
+
+    cache.invalidate("9", "update")
+    assert cache.get(by_username("carol"))[0] is False
+
+    cache.put(by_username("carol"), None, None, cache.generation)
+    cache.invalidate("9", "insert")
+    assert cache.get(by_username("carol"))[0] is False
+
+
+def test_documents_without_id_are_not_cached():
+    cache = make_cache()
+
+    cache.put(by_username("alice"), {"username": "alice"}, None, cache.generation)
+
+    assert len(cache) == 0
+
+
+def test_lru_keeps_within_byte_bound():
+    document = {"_id": "0", "username": "x" * 100}
+    cache = make_cache(max_bytes=3 * 200)
+
+    for index in range(5):
+        cache.put(by_username(f"user{index}"), {**document, "_id": str(index)}, None, cache.generation)
+        cache.get(by_username("user0"))
+
+    assert cache.total_bytes <= 3 * 200
+    assert cache.get(by_username("user0"))[0] is True
+    assert cache.get(by_username("user1"))[0] is False
+    assert cache.get(by_username("user4"))[0] is True
+
+
+def test_entry_larger_than_bound_is_not_cached():
+    cache = make_cache(max_bytes=64)
+
+    cache.put(by_username("alice"), {"_id": "1", "username": "x" * 100}, None, cache.generation)
+
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_cache_hit_does_not_change_the_stored_document():
+    cache = make_cache()
+    user_id = uuid.uuid4()
+    cache.put(by_username("alice"), {"_id": Binary.from_uuid(user_id), "username": "alice"}, None, cache.generation)
+
+    _, document = cache.get(by_username("alice"))
+    user = UserEntity.from_db(document)
+
+    assert user.id == str(user_id)
+    assert isinstance(cache.get(by_username("alice"))[1]["_id"], Binary)
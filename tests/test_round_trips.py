@@ -0,0 +1,90 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from pymongo import monitoring
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.configs.config import get_settings
+from src.middlewares.round_trip_middleware import RoundTripMiddleware
+from src.utils.round_trips import RoundTripListener, current_round_trips, round_trip_budget, track_round_trips
+
+listener = RoundTripListener()
+
+
+def send_commands(*commands: dict[str, Any]) -> None:
+    for command in commands:
+        listener.started(monitoring.CommandStartedEvent(command, "test", 1, ("localhost", 27017), 1))
+
+
+@pytest.fixture(autouse=True)
+def tracking_enabled(monkeypatch):
+    monkeypatch.setattr(get_settings(), "MONGODB_ROUND_TRIP_TRACKING", True)
+
+
+def test_budget_fails_when_total_exceeded():
+    with pytest.raises(AssertionError, match=r"2 commands > 1"), round_trip_budget(max_total=1):
+        send_commands({"find": "users", "filter": {}}, {"insert": "login_audits", "documents": []})
+
+
+def test_budget_fails_when_collection_exceeded():
+    with pytest.raises(AssertionError, match=r"2 commands on users > 1"), round_trip_budget(users=1):
+        send_commands({"find": "users", "filter": {}}, {"getMore": 1234, "collection": "users"})
+
+
+def test_budget_passes_within_limits():
+    with round_trip_budget(max_total=2, users=1) as counter:
+        send_commands({"find": "users", "filter": {}}, {"ping": 1})
+
+    assert counter.summary() == "2; ping=1; users.find=1"
+
+
+@pytest.mark.anyio
+async def test_budget_decorates_coroutines():
+    @round_trip_budget(max_total=0)
+    async def handler() -> None:
+        send_commands({"find": "users", "filter": {}})
+
+    with pytest.raises(AssertionError, match="Round-trip budget exceeded"):
+        await handler()
+
+
+def test_budget_requires_tracking(monkeypatch):
+    monkeypatch.setattr(get_settings(), "MONGODB_ROUND_TRIP_TRACKING", False)
+
+    with pytest.raises(AssertionError, match="tracking is disabled"), round_trip_budget(max_total=1):
+        pass
+
+
+def test_commands_outside_tracking_are_ignored():
+    send_commands({"find": "users", "filter": {}})
+
+    assert current_round_trips() is None
+
+
+def test_nested_counters_merge_into_parent():
+    with track_round_trips() as outer:
+        send_commands({"find": "users", "filter": {}})
+        with track_round_trips() as inner:
+            send_commands({"update": "users", "updates": []})
+        assert inner.total == 1
+        assert current_round_trips() is outer
+
+    assert outer.by_collection() == {"users": 2}
+    assert outer.summary() == "2; users.find=1; users.update=1"
+
+
+def test_middleware_sets_header():
+    async def endpoint(request: Request) -> PlainTextResponse:
+        send_commands({"find": "users", "filter": {}}, {"find": "users", "filter": {}})
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/users", endpoint)])
+    app.add_middleware(RoundTripMiddleware)
+
+    response = TestClient(app).get("/users")
+
+    assert response.headers["X-Mongo-Round-Trips"] == "2; users.find=2"
@@ -0,0 +1,79 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.configs.config import get_settings
+from src.entities.revoked_token_entity import RevokedTokenEntity
+from src.services.token_revocation_service import TokenRevocationService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeRevokedTokenRepository:
+    def __init__(self) -> None:
+        self.tokens: list[RevokedTokenEntity] = []
+        self.lookups: list[str] = []
+
+    async def create(self, entity: RevokedTokenEntity) -> RevokedTokenEntity:
+        self.tokens.append(entity)
+        return entity
+
+    async def find_by_jti(self, jti: str) -> RevokedTokenEntity | None:
+        self.lookups.append(jti)
+        return next((token for token in self.tokens if token.jti == jti), None)
+
+    async def find_revoked_since(self, since: datetime | None) -> list[RevokedTokenEntity]:
+        return [token for token in self.tokens if since is None or token.created_at >= since]
+
+
+def expires_in(minutes: int) -> datetime:
+    return datetime.now(UTC) + timedelta(minutes=minutes)
+
+
+def test_from_settings_reads_current_settings(monkeypatch):
+    monkeypatch.setattr(get_settings(), "REVOCATION_SYNC_INTERVAL_SECONDS", 0.5)
+    monkeypatch.setattr(get_settings(), "REVOCATION_BLOOM_CAPACITY", 64)
+    monkeypatch.setattr(get_settings(), "JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 15)
+
+    service = TokenRevocationService.from_settings(FakeRevokedTokenRepository())
+
+    assert service.sync_interval_seconds == 0.5
+    assert service.bloom_capacity == 64
+    assert service.default_token_ttl == timedelta(minutes=15)
+
+
+async def test_revoked_token_is_rejected():
+    repository = FakeRevokedTokenRepository()
+    service = TokenRevocationService(repository, bloom_capacity=64)
+
+    await service.revoke("a", "u1", expires_in(5))
+
+    assert await service.is_revoked("a")
+    assert not await service.is_revoked("b")
+    assert repository.lookups == []
+
+
+async def test_sync_picks_up_revocations_from_other_workers():
+    repository = FakeRevokedTokenRepository()
+    service = TokenRevocationService(repository, bloom_capacity=64)
+    await service.sync()
+
+    repository.tokens.append(RevokedTokenEntity(jti="a", expires_at=expires_in(5)))
+    await service.sync()
+
+    assert await service.is_revoked("a")
+    assert repository.lookups == []
+
+
+async def test_expired_revocations_are_pruned():
+    repository = FakeRevokedTokenRepository()
+    service = TokenRevocationService(repository, bloom_capacity=2)
+
+    await service.revoke("old", None, expires_in(-1))
+    await service.revoke("new", None, expires_in(5))
+    await service.revoke("newer", None, expires_in(5))
+    await service.sync()
+
+    repository.tokens.clear()
+    assert not await service.is_revoked("old")
+    assert await service.is_revoked("new")
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Any
+
+from pymongo import InsertOne
+import pytest
+
+from src.configs.database_config import MongoDB
+from src.utils.write_behind import WriteBehindBuffer
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+        self.failures = 0
+
+    @property
+    def written(self) -> int:
+        return sum(self.batches)
+
+    async def bulk_write(self, operations: list[Any], ordered: bool) -> None:  # noqa: ARG002
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("unexpected")
+        self.batches.append(len(operations))
+
+
+@pytest.fixture
+def collection(monkeypatch) -> FakeCollection:
+    collection = FakeCollection()
+    monkeypatch.setattr(MongoDB, "get_collection", lambda *_, **__: collection)
+    return collection
+
+
+async def enqueue(buffer: WriteBehindBuffer, count: int) -> list[bool]:
+    return [await buffer.enqueue("login_audits", InsertOne({"n": n}), database_name="test") for n in range(count)]
+
+
+async def wait_for_writes(collection: FakeCollection, count: int) -> None:
+    for _ in range(100):
+        if collection.written >= count:
+            return
+        await asyncio.sleep(0.01)
+
+
+async def test_full_batch_flushes_before_interval(collection):
+    buffer = WriteBehindBuffer(batch_size=3, flush_interval_seconds=60)
+    await buffer.start()
+
+    await enqueue(buffer, 4)
+    await wait_for_writes(collection, 3)
+
+    assert collection.batches == [3]
+    await buffer.stop()
+    assert collection.batches == [3, 1]
+
+
+async def test_partial_batch_flushes_after_interval(collection):
+    buffer = WriteBehindBuffer(batch_size=100, flush_interval_seconds=0.05)
+    await buffer.start()
+
+    await enqueue(buffer, 2)
+    await wait_for_writes(collection, 2)
+
+    assert collection.batches == [2]
+    assert buffer.metrics.flushes == 1
+    await buffer.stop()
+
+
+async def test_drop_policy_rejects_when_full(collection):
+    buffer = WriteBehindBuffer(max_queue_size=2, overflow_policy="drop")
+
+    assert await enqueue(buffer, 3) == [True, True, False]
+    assert buffer.metrics.dropped == 1
+    assert buffer.metrics.enqueued == 2
+
+    await buffer.stop()
+    assert collection.written == 2
+
+
+async def test_block_policy_waits_for_room(collection):
+    buffer = WriteBehindBuffer(max_queue_size=1, flush_interval_seconds=0.01, overflow_policy="block")
+    await enqueue(buffer, 1)
+
+    blocked = asyncio.create_task(enqueue(buffer, 1))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    await buffer.start()
+    assert await asyncio.wait_for(blocked, 1) == [True]
+    await buffer.stop()
+
+    assert buffer.metrics.dropped == 0
+    assert collection.written == 2
+
+
+async def test_stop_drains_queue_in_batches(collection):
+    buffer = WriteBehindBuffer(batch_size=2, flush_interval_seconds=60)
+
+    await enqueue(buffer, 5)
+    await buffer.stop()
+
+    assert collection.batches == [2, 2, 1]
+    assert buffer.metrics.queue_depth == 0
+    assert buffer.metrics.written == 5
+
+
+async def test_unexpected_flush_error_keeps_loop_running(collection):
+    collection.failures = 1
+    buffer = WriteBehindBuffer(batch_size=2, flush_interval_seconds=60)
+    await buffer.start()
+
+    await enqueue(buffer, 4)
+    await wait_for_writes(collection, 2)
+    await buffer.stop()
+
+    assert collection.batches == [2]
+    assert buffer.metrics.failed == 2
+    assert buffer.metrics.written == 2